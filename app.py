@@ -1,12 +1,10 @@
 import streamlit as st
-import requests, zipfile, io, os
-import pandas as pd
-import geopandas as gpd
-from shapely.geometry import Point
-import branca
-import folium
-from folium.plugins import BeautifyIcon
-from streamlit_folium import st_folium
+from snowlines.regional import read_regional_zip, start_background_refresh
+from snowlines import timing
+from snowlines.debug_panel import finish_page
+from snowlines.app_state import get_catalog, get_search_index, get_locator
+# folium/branca/streamlit_folium are only needed once a glacier is chosen, and
+# snowlines.catalog/search/spatial pull in pandas and numpy: both are imported where first used
 
 st.set_page_config(
     page_title="Alaska Snowlines",
@@ -21,9 +19,15 @@ def nav():
         st.page_link("https://alaskasnowlines.streamlit.app/plot_elev", label="Heatmap – elevation bins")
         st.page_link("https://alaskasnowlines.streamlit.app/plot_area", label="Heatmap - area bins")
         st.page_link("https://alaskasnowlines.streamlit.app/plot_gif", label="Glacier animations")
+        st.page_link("https://alaskasnowlines.streamlit.app/compare", label="Compare glaciers")
+        st.page_link("https://alaskasnowlines.streamlit.app/melt_metrics", label="Regional melt metrics")
+        st.page_link("https://alaskasnowlines.streamlit.app/snowline_fractions", label="Regional snowline fractions")
+        st.page_link("https://alaskasnowlines.streamlit.app/bulk_export", label="Bulk download")
         st.page_link("https://doi.org/10.1038/s41612-026-01321-y", label="Publication")
 nav()
 
+timing_run = timing.start_run("home")
+
 # ---------------- Navigation links ----------------
 st.markdown(
     """
@@ -64,18 +68,6 @@ st.markdown(
 
 st.write("## Visualizing Alaska Snowlines and Melt Extents")
 
-# ---------------- Load glacier dataset ----------------
-csv_path = os.path.join("data", "RGI2000-v7.0-G-01_alaska_2km2.csv")
-with st.spinner("Loading glacier outlines..."):
-    def load_glaciers(url):
-        gdf = pd.read_csv(csv_path)
-        return gdf
-    
-    df = load_glaciers(csv_path)
-    df = df[df["area_km2"] > 2].copy()
-    df = df[~df["glac_name"].str.contains("_abl", case=False, na=False)].copy()
-    st.session_state["gdf"] = df
-
 # ---------------- User input ----------------
 def clear_manual():
     st.session_state.manual_input = ""
@@ -86,22 +78,16 @@ manual_input = st.text_input("Enter a glacier name or RGI number (e.g. Gulkana G
 coord_input = st.text_input("Or enter lat, lon coordinates (e.g. 63.28,-145.42):", key="coord_input", on_change=clear_manual)
 
 if manual_input:
-    matches = df[
-        df["rgi_id"].str.contains(manual_input, case=False, na=False) |
-        df["glac_name"].str.contains(manual_input, case=False, na=False)
-    ]
+    index = get_search_index()
+    matches = index.search(manual_input)
 
-    if not matches.empty:
+    if matches:
         if len(matches) > 1:
             st.info(f"Found {len(matches)} possible matches. Please choose one:")
-            selected = st.selectbox(
-                "Select glacier:",
-                matches["rgi_id"],
-                format_func=lambda rid: f"{rid} – {matches.loc[matches['rgi_id']==rid, 'glac_name'].values[0]}"
-            )
-            glacier = matches[matches["rgi_id"] == selected].iloc[0]
+            selected = st.selectbox("Select glacier:", matches, format_func=index.label)
+            glacier = get_catalog().loc[selected]
         else:
-            glacier = matches.iloc[0]
+            glacier = get_catalog().loc[matches[0]]
             st.success(f"Found glacier: {glacier['glac_name']} ({glacier['rgi_id']})")
     else:
         glacier = None
@@ -109,21 +95,39 @@ if manual_input:
 elif coord_input:
     try:
         lat, lon = map(float, coord_input.split(","))
-        point = Point(lon, lat)
-        gdf = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df["cenlon"], df["cenlat"]), crs="EPSG:4326")
-        gdf["distance"] = gdf.geometry.distance(point)
-        nearest = gdf.nsmallest(10, "distance").copy()
-
-        st.info(f"Found {len(nearest)} nearest glaciers. Please choose one:")
-        selected = st.selectbox(
-            "Select glacier:",
-            nearest["rgi_id"],
-            format_func=lambda rid: f"{rid} – {nearest.loc[nearest['rgi_id']==rid, 'glac_name'].values[0]}"
-        )
-        glacier = nearest[nearest["rgi_id"] == selected].iloc[0]
-    except Exception:
+    except ValueError:
+        lat = lon = None
         glacier = None
         st.error("Invalid coordinates. Please enter in 'lat,lon' format.")
+
+    if lat is not None:
+        col1, col2, col3 = st.columns([2, 2, 1])
+        with col1:
+            mode = st.radio("Show", ["10 nearest glaciers", "All glaciers within"], horizontal=True)
+        with col2:
+            to = st.radio("Distance to", ["centroid", "terminus", "either"], horizontal=True)
+        with col3:
+            radius_km = st.number_input("Radius [km]", min_value=1.0, max_value=500.0, value=25.0, step=5.0,
+                                        disabled=mode != "All glaciers within")
+
+        locator = get_locator()
+        if mode == "All glaciers within":
+            nearest = locator.within(lat, lon, radius_km, to=to)
+        else:
+            nearest = locator.nearest(lat, lon, 10, to=to)
+
+        if nearest:
+            st.info(f"Found {len(nearest)} glaciers. Please choose one:")
+            index = get_search_index()
+            selected = st.selectbox(
+                "Select glacier:",
+                nearest,
+                format_func=lambda hit: f"{index.label(hit[0])} ({hit[1]:.1f} km to {hit[2]})"
+            )
+            glacier = get_catalog().loc[selected[0]]
+        else:
+            glacier = None
+            st.info(f"No glacier within {radius_km:g} km.")
 else:
     glacier = None
         
@@ -153,10 +157,16 @@ custom_css = """
 }
 </style>
 """
-css_element = branca.element.Element(custom_css)
 
 # ---------------- Static map centered on glacier ----------------
 if glacier is not None:
+    import branca
+    import folium
+    from folium.plugins import BeautifyIcon
+    from streamlit_folium import st_folium
+    from snowlines.prefetch import cancel_glacier, prefetch_glacier
+
+    css_element = branca.element.Element(custom_css)
     center = [glacier["cenlat"], glacier["cenlon"]]
     m = folium.Map(location=center, zoom_start=10, tiles="CartoDB positron", name="Basemap")
     m.get_root().html.add_child(css_element)
@@ -171,13 +181,22 @@ if glacier is not None:
     rgi_no = "01." + glacier['rgi_id'][-5:]
     plot_url1 = f"https://alaskasnowlines.streamlit.app/plot_elev?rgi_no={rgi_no}"
     plot_url2 = f"https://alaskasnowlines.streamlit.app/plot_area?rgi_no={rgi_no}"
-    try:
-        glac_name_short = glacier['glac_name'].replace(" Glacier", "").replace("_abl", "").strip()
-        glac_name_short = glac_name_short.replace("/", "-")
+    # unnamed glaciers (empty name in the catalog) get the generic animation page
+    glac_name_short = glacier['glac_name'].replace(" Glacier", "").replace("_abl", "").strip()
+    glac_name_short = glac_name_short.replace("/", "-")
+    if glac_name_short:
         plot_url3 = f"https://alaskasnowlines.streamlit.app/plot_gif?name={glac_name_short}&rgi_id={rgi_no[-5:]}"
-    except:
+    else:
         plot_url3 = f"https://alaskasnowlines.streamlit.app/plot_gif"
 
+    # warm the disk cache for the linked pages; picking another glacier cancels what is still queued
+    previous = st.session_state.get("prefetched")
+    if previous != rgi_no:
+        if previous is not None:
+            cancel_glacier(previous)
+        prefetch_glacier(rgi_no, glac_name_short)
+        st.session_state["prefetched"] = rgi_no
+
     popup_html = f"""
     <div style="
         background-color:#bebebe;  /* light steelblue background */
@@ -237,19 +256,9 @@ if glacier is not None:
 else:
     st.error("No matching glacier found.")
 
-# download button
-@st.cache_data
-def fetch_regional_zip():
-    url = "https://raw.githubusercontent.com/albinwwells/AlaskaSnowlines/main/data/regional_me_sl.zip"
-    response = requests.get(url)
-    if response.status_code == 200:
-        # Ensure bytes
-        return bytes(response.content)
-    else:
-        st.error(f"Failed to fetch file (HTTP {response.status_code})")
-        return None
-
-reg_zip = fetch_regional_zip()
+# download button: the regional bundle ships in data/, an optional refresh runs in the background
+start_background_refresh()
+reg_zip = read_regional_zip()
 
 st.markdown(
     """
@@ -278,6 +287,9 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
+
+finish_page(timing_run)
+
 # ----- old code: too slow / too expensive -----
 # import streamlit as st
 # import pandas as pd
@@ -0,0 +1 @@
+"""Benchmarks for the data pipeline; run the scripts with ``python -m benchmarks.<name>``."""
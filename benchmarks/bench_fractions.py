@@ -0,0 +1,86 @@
+"""Check the batched LTTB against a one-series reference and compare chart payloads with the raw daily columns.
+
+    python -m benchmarks.bench_fractions
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from streamlit import dataframe_util
+from streamlit.elements.lib.built_in_chart_utils import ChartType, generate_chart
+
+from snowlines.fractions import VALUES, FractionStore, lttb, read_fractions
+from snowlines.regional import SNOWLINE_FRACTIONS_CSV, read_member
+
+
+def reference_lttb(x, y, n_out):
+    """Textbook LTTB on one NaN-free series, point by point."""
+    n = len(x)
+    every = (n - 2) / (n_out - 2)
+    keep, a = [0], 0
+    for b in range(n_out - 2):
+        lo, hi = int(b * every) + 1, int((b + 1) * every) + 1
+        nlo, nhi = hi, min(int((b + 2) * every) + 1, n)
+        cx, cy = sum(x[nlo:nhi]) / (nhi - nlo), sum(y[nlo:nhi]) / (nhi - nlo)
+        best, best_area = lo, -1.0
+        for i in range(lo, hi):
+            area = abs((x[a] - cx) * (y[i] - y[a]) - (x[a] - x[i]) * (cy - y[a]))
+            if area > best_area:
+                best, best_area = i, area
+        keep.append(best)
+        a = best
+    return keep + [n - 1]
+
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), out
+
+
+def chart_payload(data, **kwargs):
+    chart = generate_chart(ChartType.LINE, data, **kwargs)
+    return len(dataframe_util.convert_anything_to_arrow_bytes(chart.data))
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    x = np.arange(2922, dtype=float)
+    y = np.cumsum(rng.normal(0, 1, (6, len(x))), axis=1)
+    for n_out in (3, 50, 800, 2000):
+        batched = lttb(x, y, n_out)
+        for row in range(len(y)):
+            assert batched[row].tolist() == reference_lttb(x.tolist(), y[row].tolist(), n_out), (n_out, row)
+    gappy = y.copy()
+    gappy[:, 1000:1500] = np.nan
+    picked = np.take_along_axis(gappy, lttb(x, gappy, 800), axis=1)
+    assert np.isnan(picked).any(axis=1).all() and np.isnan(picked).sum(axis=1).max() < 800 * 600 / 2922
+    print("lttb matches the reference; gaps stay gaps")
+
+    raw = read_member(SNOWLINE_FRACTIONS_CSV)
+    t_csv, _ = best_of(lambda: pd.read_csv(__import__("io").BytesIO(raw)))
+    t_store, store = best_of(lambda: FractionStore(read_fractions(raw)))
+    print(f"read csv {t_csv * 1e3:.0f} ms, build long-form store {t_store * 1e3:.0f} ms, "
+          f"{store.df.memory_usage(deep=True).sum() / 1e6:.2f} MB long + "
+          f"{sum(m.nbytes for m in store.matrix.values()) / 1e6:.2f} MB matrices")
+
+    label = VALUES["frac_sl"]
+    cases = [
+        ("all series, 2017-2024", store.series, None, None),
+        ("ascending, 2017-2024", [k for k in store.series if k[1] == "Ascending"], None, None),
+        ("all series, 2021-2022", store.series, "2021-01-01", "2022-12-31"),
+        ("Alaska, 2017-2024", [k for k in store.series if k[0] == "Alaska"], None, None),
+    ]
+    print(f"\n{'view':>22} {'raw points':>11} {'raw [kB]':>9} {'raw [ms]':>9} "
+          f"{'lttb points':>12} {'lttb [kB]':>10} {'lttb [ms]':>10} {'smaller':>8}")
+    for name, series, start, end in cases:
+        t_raw, raw_bytes = best_of(lambda: chart_payload(store.raw("frac_sl", series, start, end), y_axis_label=label))
+        wide = store.raw("frac_sl", series, start, end)
+        t_ds, ds_bytes = best_of(lambda: chart_payload(store.downsampled("frac_sl", series, start, end),
+                                                     x_from_user="date", y_from_user=label, color_from_user="series"))
+        ds = store.downsampled("frac_sl", series, start, end)
+        print(f"{name:>22} {wide.size:>11} {raw_bytes / 1e3:>9.0f} {t_raw * 1e3:>9.1f} "
+              f"{len(ds):>12} {ds_bytes / 1e3:>10.0f} {t_ds * 1e3:>10.1f} {raw_bytes / ds_bytes:>7.1f}x")
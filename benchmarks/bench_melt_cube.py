@@ -0,0 +1,69 @@
+"""Check the melt-metrics cube against pandas group-bys on the full table and time both.
+
+    python -m benchmarks.bench_melt_cube
+"""
+import time
+
+import numpy as np
+
+from snowlines.melt_metrics import METRICS, MeltCube, read_melt_metrics
+
+QUERIES = [
+    ("glacier_melt_days", ("subregion",), None, None, None),
+    ("doy_me_start_50", ("year",), ["Coast", "Kenai"], None, ["Ascending"]),
+    ("tbias_opt", ("subregion", "year"), None, [2019, 2020, 2021], None),
+    ("doy_me_end_50", ("year", "direction"), ["St. Elias"], None, None),
+]
+
+
+def groupby_table(df, metric, by, subregions, years, directions):
+    """The same area-weighted means straight from the rows."""
+    df = df.assign(weight=df["area_km2"].astype(float)
+                   / df.groupby(["rgi_id", "year", "direction"], observed=True)["area_km2"].transform("size"))
+    if subregions is not None:
+        df = df[df["subregion"].isin(subregions)]
+    if years is not None:
+        df = df[df["year"].isin(years)]
+    if directions is not None:
+        df = df[df["direction"].isin(directions)]
+    df = df[df[metric].notna()]
+    df = df.assign(wx=df["weight"] * df[metric].astype(float))
+    g = df.groupby(list(by), observed=True)[["wx", "weight"]].sum()
+    return (g["wx"] / g["weight"]).to_numpy()
+
+
+def best_of(fn, repeat=10):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+if __name__ == "__main__":
+    t0 = time.perf_counter()
+    df = read_melt_metrics()
+    t_load = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    cube = MeltCube(df)
+    t_cube = time.perf_counter() - t0
+    print(f"{len(df)} rows loaded in {t_load * 1e3:.0f} ms, cube of {cube.rows.size} cells built in {t_cube * 1e3:.0f} ms\n")
+
+    print(f"{'metric':>18} {'group by':>20} {'group-by [ms]':>14} {'cube [ms]':>10} {'speedup':>8}")
+    for metric, by, subregions, years, directions in QUERIES:
+        expected = groupby_table(df, metric, by, subregions, years, directions)
+        table = cube.table(metric, by, subregions, years, directions)
+        assert np.allclose(table[metric].to_numpy(), expected, equal_nan=True), (metric, by)
+        t_old = best_of(lambda: groupby_table(df, metric, by, subregions, years, directions))
+        t_new = best_of(lambda: cube.table(metric, by, subregions, years, directions))
+        print(f"{metric:>18} {' x '.join(by):>20} {t_old * 1e3:>14.2f} {t_new * 1e3:>10.2f} {t_old / t_new:>7.0f}x")
+
+    rgi_id = df["rgi_id"].iloc[0]
+    t_scan = best_of(lambda: df[df["rgi_id"] == rgi_id])
+    t_index = best_of(lambda: cube.glacier_rows(rgi_id))
+    assert cube.glacier_rows(rgi_id).equals(df[df["rgi_id"] == rgi_id])
+    rows = cube.cell_rows(["Kenai"], [2020], None)
+    assert rows.equals(df[(df["subregion"] == "Kenai") & (df["year"] == 2020)])
+    print(f"\nglacier drill-down: scan {t_scan * 1e3:.2f} ms, index {t_index * 1e3:.3f} ms")
+    print(f"metrics: {', '.join(METRICS.values())}")
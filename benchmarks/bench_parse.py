@@ -0,0 +1,66 @@
+"""Compare the parallel bytes parser with the previous decode/StringIO parsing path, and the
+one-pass parse of every variant with the four separate parses the heatmap pages used to run.
+
+    python -m benchmarks.bench_parse
+"""
+import io
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import glacier_zip
+from snowlines.parse import VARIANTS, parse_all, parse_glacier
+
+
+def legacy_parse(zip_bytes: bytes):
+    """The page code before snowlines.parse: decode every member, StringIO, to_datetime on columns."""
+    result = []
+    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as gzf:
+        for fname in gzf.namelist():
+            if "snowline_elev_percentile" in fname and "eos_corr" not in fname and "eabin" not in fname:
+                sl_df = pd.read_csv(io.StringIO(gzf.read(fname).decode()), index_col=0)
+                sl_df.index = pd.to_datetime(sl_df.index, format='%Y-%m-%d')
+                me_df = pd.read_csv(io.StringIO(gzf.read(fname.replace("snowline", "melt_extent")).decode()), index_col=0)
+                me_df.index = pd.to_datetime(me_df.index, format='%Y-%m-%d')
+                db_df = pd.read_csv(io.StringIO(gzf.read(fname.replace("snowline_elev_percentile", "db_bin_mean")).decode()), index_col=0)
+                db_df.columns = pd.to_datetime(db_df.columns)
+                hyps_df = pd.read_csv(io.StringIO(gzf.read(fname.replace("snowline_elev_percentile", "hypsometry")).decode()), index_col=0)
+                result.append((db_df, hyps_df, sl_df, me_df))
+    return result
+
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), out
+
+
+if __name__ == "__main__":
+    print(f"{'pathrows':>8} {'legacy [ms]':>12} {'parallel [ms]':>14} {'speedup':>8}")
+    for n_pathrows in [1, 3, 5, 8]:
+        zip_bytes = glacier_zip(n_pathrows=n_pathrows)
+        t_legacy, legacy = best_of(lambda: legacy_parse(zip_bytes))
+        t_new, new = best_of(lambda: parse_glacier(zip_bytes))
+        for (db_df, hyps_df, sl_df, me_df), d in zip(legacy, new):
+            assert np.array_equal(db_df.columns.values.astype("datetime64[ns]"), d["dates"])
+            assert np.allclose(db_df.to_numpy(), d["db_bin"])
+            assert np.allclose(sl_df.iloc[:, 0].to_numpy(), d["sl"])
+        print(f"{n_pathrows:>8} {t_legacy * 1e3:>12.1f} {t_new * 1e3:>14.1f} {t_legacy / t_new:>7.1f}x")
+
+    print(f"\n{'pathrows':>8} {'4 parses [ms]':>14} {'parse_all [ms]':>15} {'speedup':>8}")
+    for n_pathrows in [1, 3, 5, 8]:
+        zip_bytes = glacier_zip(n_pathrows=n_pathrows)
+        t_separate, separate = best_of(lambda: {(v, eos): parse_glacier(zip_bytes, v, eos)
+                                                for v in VARIANTS for eos in (False, True)})
+        t_all, everything = best_of(lambda: parse_all(zip_bytes))
+        for (variant, eos), pathrows in separate.items():
+            sl, me = ("sl_eos", "me_eos") if eos else ("sl", "me")
+            for d, a in zip(pathrows, everything[variant]):
+                assert np.array_equal(d["db_bin"], a["db_bin"], equal_nan=True)
+                assert np.array_equal(d["sl"], a[sl], equal_nan=True) and np.array_equal(d["me"], a[me], equal_nan=True)
+        print(f"{n_pathrows:>8} {t_separate * 1e3:>14.1f} {t_all * 1e3:>15.1f} {t_separate / t_all:>7.1f}x")
@@ -0,0 +1,58 @@
+"""Check the vectorized 12-day regridding against the previous loop and time both.
+
+    python -m benchmarks.bench_regrid
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from snowlines.regrid import regrid_12d
+
+
+def legacy_regrid(db_bin, dates, frame_cut=0):
+    """The loop plot_db_heatmap used before snowlines.regrid."""
+    dates_12d = pd.date_range(dates[frame_cut], dates[-1], freq='12D')
+    dates_12d_str = [x.strftime('%Y%m%d') for x in dates_12d]
+    db_bin_12d = np.zeros((db_bin.shape[0], len(dates_12d)))
+    db_bin_12d[:] = np.nan
+    for ndate, date in enumerate(dates_12d_str):
+        date_np = np.datetime64(f'{date[:4]}-{date[4:6]}-{date[6:]}').astype('datetime64[ns]')
+        if date_np in dates:
+            date_idx = np.where(dates == date_np)[0][0]
+            db_bin_12d[:, ndate] = db_bin[:, date_idx]
+    return dates_12d, db_bin_12d
+
+
+def synthetic_record(freq_days, drop=0.2, n_bins=60, seed=0, start="2016-01-01", end="2025-01-01"):
+    """Irregular 2016-2025 acquisitions: a regular orbit with dropped scenes and a few repeats."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, end, freq=f"{freq_days}D").values
+    dates = dates[rng.random(len(dates)) > drop]
+    dates = np.sort(np.concatenate([dates, rng.choice(dates, 5)]))  # duplicate acquisitions
+    return rng.normal(-12, 4, (n_bins, len(dates))), dates.astype("datetime64[ns]")
+
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+if __name__ == "__main__":
+    print(f"{'record':>22} {'columns':>8} {'loop [ms]':>10} {'vectorized [ms]':>16} {'speedup':>8}")
+    for freq_days, frame_cut in [(12, 0), (6, 0), (6, 10), (1, 0)]:
+        db_bin, dates = synthetic_record(freq_days)
+        grid_old, out_old = legacy_regrid(db_bin, dates, frame_cut)
+        grid_new, out_new, matched = regrid_12d(db_bin, dates, frame_cut)
+        assert np.array_equal(grid_old.values, grid_new)
+        assert np.array_equal(out_old, out_new, equal_nan=True)
+        assert np.array_equal(matched, ~np.isnan(out_new).all(axis=0))
+
+        t_old = best_of(lambda: legacy_regrid(db_bin, dates, frame_cut))
+        t_new = best_of(lambda: regrid_12d(db_bin, dates, frame_cut))
+        label = f"{freq_days}-day, frame_cut={frame_cut}"
+        print(f"{label:>22} {len(dates):>8} {t_old * 1e3:>10.2f} {t_new * 1e3:>16.3f} {t_old / t_new:>7.0f}x")
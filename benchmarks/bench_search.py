@@ -0,0 +1,52 @@
+"""Check the glacier search index against the pandas substring scan and time both.
+
+    python -m benchmarks.bench_search
+"""
+import time
+
+import pandas as pd
+
+from snowlines.catalog import CATALOG_CSV
+from snowlines.search import GlacierIndex
+
+QUERIES = ["gulkana", "Kennicott", "glacier", "ice", "00570", "01.00208", "RGI2000-v7.0-G-01-0", "west fork", "kenicott", "Gulkanna"]
+
+
+def legacy_search(df, query):
+    """The two str.contains scans plus per-option label lookups the pages used."""
+    matches = df[
+        df["rgi_id"].str.contains(query, case=False, na=False) |
+        df["glac_name"].str.contains(query, case=False, na=False)
+    ]
+    labels = [f"{rid} – {matches.loc[matches['rgi_id']==rid, 'glac_name'].values[0]}" for rid in matches["rgi_id"]]
+    return list(matches["rgi_id"]), labels
+
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+if __name__ == "__main__":
+    df = pd.read_csv(CATALOG_CSV)
+    df = df[df["area_km2"] > 2]
+    df = df[~df["glac_name"].str.contains("_abl", case=False, na=False)]
+    t0 = time.perf_counter()
+    index = GlacierIndex(df["rgi_id"], df["glac_name"])
+    print(f"index of {len(index)} glaciers built in {(time.perf_counter() - t0) * 1e3:.1f} ms\n")
+
+    print(f"{'query':>22} {'matches':>8} {'scan [ms]':>10} {'index [ms]':>11} {'speedup':>8}  top match")
+    for query in QUERIES:
+        ids, _ = legacy_search(df, query)
+        found = index.search(query)
+        if ids:  # literal matches are the same set, only ranked
+            assert sorted(found) == sorted(ids), query
+
+        t_old = best_of(lambda: legacy_search(df, query))
+        t_new = best_of(lambda: [index.label(rid) for rid in index.search(query)])
+        top = index.label(found[0]) if found else "-"
+        print(f"{query:>22} {len(found):>8} {t_old * 1e3:>10.2f} {t_new * 1e3:>11.3f} {t_old / t_new:>7.0f}x  {top}")
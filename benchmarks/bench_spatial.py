@@ -0,0 +1,66 @@
+"""Check the spherical KD-tree against brute-force haversine and time it against the GeoDataFrame scan.
+
+    python -m benchmarks.bench_spatial
+"""
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from snowlines.catalog import CATALOG_CSV
+from snowlines.spatial import GlacierLocator, haversine_km
+
+POINTS = [(63.28, -145.42), (61.5, -142.9), (58.4, -134.5), (55.0, -160.5), (68.5, -150.0)]
+
+
+def legacy_nearest(df, lat, lon, k=10):
+    """What app.py did per rerun: a GeoDataFrame and planar distance in degrees."""
+    import geopandas as gpd  # no longer an app dependency: pip install geopandas to compare
+    from shapely.geometry import Point
+    gdf = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df["cenlon"], df["cenlat"]), crs="EPSG:4326")
+    gdf["distance"] = gdf.geometry.distance(Point(lon, lat))
+    return gdf.nsmallest(k, "distance")["rgi_id"].tolist()
+
+
+def brute_force(df, lat, lon, to):
+    d_cen = haversine_km(lat, lon, df["cenlat"].values, df["cenlon"].values)
+    d_term = haversine_km(lat, lon, df["termlat"].values, df["termlon"].values)
+    return {"centroid": d_cen, "terminus": d_term, "either": np.minimum(d_cen, d_term)}[to]
+
+
+def best_of(fn, repeat=20):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore", message="Geometry is in a geographic CRS")  # that is the point
+    df = pd.read_csv(CATALOG_CSV)
+    df = df[df["area_km2"] > 2]
+    df = df[~df["glac_name"].str.contains("_abl", case=False, na=False)].reset_index(drop=True)
+    t0 = time.perf_counter()
+    locator = GlacierLocator(df["rgi_id"], df["cenlat"], df["cenlon"], df["termlat"], df["termlon"])
+    print(f"trees for {len(df)} glaciers built in {(time.perf_counter() - t0) * 1e3:.1f} ms\n")
+
+    for lat, lon in POINTS:
+        for to in ("centroid", "terminus", "either"):
+            truth = brute_force(df, lat, lon, to)
+            nearest = locator.nearest(lat, lon, 10, to=to)
+            assert np.allclose([d for _, d, _ in nearest], np.sort(truth)[:10])
+            within = locator.within(lat, lon, 50, to=to)
+            assert sorted(rid for rid, _, _ in within) == sorted(df["rgi_id"][truth <= 50])
+            assert np.allclose([d for _, d, _ in within], np.sort(truth[truth <= 50]))
+
+    print(f"{'point':>18} {'geodataframe [ms]':>18} {'10-nn [us]':>11} {'50 km [us]':>11} {'same 10':>8}")
+    for lat, lon in POINTS:
+        t_old = best_of(lambda: legacy_nearest(df, lat, lon), repeat=5)
+        t_knn = best_of(lambda: locator.nearest(lat, lon, 10))
+        t_rad = best_of(lambda: locator.within(lat, lon, 50))
+        # planar degrees overweight longitude at these latitudes, so the old top 10 differs
+        same = len(set(legacy_nearest(df, lat, lon)) & {rid for rid, _, _ in locator.nearest(lat, lon, 10)})
+        print(f"{f'{lat}, {lon}':>18} {t_old * 1e3:>18.2f} {t_knn * 1e6:>11.0f} {t_rad * 1e6:>11.0f} {same:>6}/10")
@@ -0,0 +1,58 @@
+"""Time the cold start of every page; fails if a first render imports a heavy module not listed in PAGES.
+
+    python -m benchmarks.bench_startup
+"""
+import json
+import os
+import subprocess
+import sys
+
+# page -> heavy modules its first render needs (the regional pages show their data right away)
+PAGES = {
+    "app.py": (),
+    "pages/plot_elev.py": (),
+    "pages/plot_area.py": (),
+    "pages/plot_gif.py": (),
+    "pages/compare.py": (),
+    "pages/bulk_export.py": (),
+    "pages/melt_metrics.py": ("pandas", "numpy"),
+    "pages/snowline_fractions.py": ("pandas", "numpy"),
+}
+HEAVY = ["pandas", "numpy", "matplotlib", "folium", "branca", "streamlit_folium", "geopandas", "shapely"]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+import streamlit
+from streamlit.testing.v1 import AppTest
+t_import = time.perf_counter() - t0
+before = set(sys.modules)
+at = AppTest.from_file(os.path.abspath(sys.argv[1]), default_timeout=120)
+t0 = time.perf_counter()
+at.run()
+t_first = time.perf_counter() - t0
+t0 = time.perf_counter()
+at.run()
+t_warm = time.perf_counter() - t0
+loaded = sorted({name.split(".")[0] for name in set(sys.modules) - before})
+print(json.dumps({"import": t_import, "first": t_first, "warm": t_warm, "loaded": loaded}))
+"""
+
+
+def probe(page: str):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    out = subprocess.run([sys.executable, "-c", _PROBE, page], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    failed = False
+    print(f"{'page':>28} {'streamlit [s]':>14} {'first run [s]':>14} {'rerun [s]':>10}  heavy modules on first render")
+    for page, allowed in PAGES.items():
+        result = probe(page)
+        heavy = [name for name in HEAVY if name in result["loaded"]]
+        failed |= any(name not in allowed for name in heavy)
+        print(f"{page:>28} {result['import']:>14.2f} {result['first']:>14.2f} {result['warm']:>10.2f}  {', '.join(heavy) or '-'}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,119 @@
+"""Time each pipeline stage on synthetic data, relative to a reference workload, against a stored baseline.
+
+    python -m benchmarks.bench_suite [--update-baseline]
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+import zipfile
+
+import numpy as np
+
+from benchmarks.bench_search import QUERIES
+from benchmarks.bench_spatial import POINTS
+from benchmarks.fixtures import glacier_zip, outer_zip
+from snowlines.catalog import read_catalog_csv
+from snowlines.parse import parse_all
+from snowlines.plotting import dates_filter_for_plotting, render_pathrow
+from snowlines.regrid import regrid_12d
+from snowlines.search import load_index
+from snowlines.spatial import load_locator
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+TOLERANCE = 1.5  # fail when a stage takes more than 1.5x its baseline
+
+
+def best_of(fn, repeat=5, min_sample=0.05):
+    """Best time per call; fast stages are looped so each sample lasts at least `min_sample` seconds."""
+    t0 = time.perf_counter()
+    fn()
+    number = max(1, int(min_sample / max(time.perf_counter() - t0, 1e-9)))
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - t0) / number)
+    return min(times)
+
+
+def reference():
+    """Fixed mix of interpreter and numpy work that no change to the package affects."""
+    rng = np.random.default_rng(0)
+    np.sort(rng.normal(size=200_000))
+    sum(i * i for i in range(100_000))
+
+
+def stages():
+    """{stage: (zero-argument callable, repeats)} over fixtures built once up front."""
+    rgi_nos = [f"01.{n:05d}" for n in range(570, 590)]
+    outer = outer_zip(rgi_nos, n_pathrows=1)
+    inner = glacier_zip(n_pathrows=4)
+    data = parse_all(inner)["elev"][0]
+    dates, db_bin = dates_filter_for_plotting(data["dates"], data["db_bin"])
+    catalog = read_catalog_csv()
+    index, locator = load_index(catalog), load_locator(catalog)
+
+    def unzip():
+        with zipfile.ZipFile(io.BytesIO(outer)) as zf:
+            for name in zf.namelist():
+                zf.read(name)
+
+    return {
+        "unzip (20 glaciers)": (unzip, 5),
+        "parse (4 pathrows)": (lambda: parse_all(inner), 5),
+        "regrid (1 pathrow)": (lambda: regrid_12d(db_bin, dates), 7),
+        "render (1 pathrow)": (lambda: render_pathrow(data, "01.00570"), 3),
+        "search (10 queries)": (lambda: [index.search(query) for query in QUERIES], 7),
+        "nearest (5 points)": (lambda: [locator.nearest(lat, lon, 10) for lat, lon in POINTS], 7),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the pipeline stages against a stored baseline.")
+    parser.add_argument("--update-baseline", action="store_true", help="write this run's timings as the baseline (record it on the machine that runs the suite)")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed slowdown factor per stage")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON file")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["seconds"]
+        if "reference" not in baseline:  # cannot be compared relative to the reference
+            baseline = {}
+
+    results, failed = {}, []
+    t_ref = best_of(reference, 7)
+    print(f"{'stage':>22} {'baseline [ms]':>14} {'now [ms]':>10} {'ratio':>6}")
+    before = f"{baseline['reference'] * 1e3:.2f}" if baseline else "-"
+    print(f"{'reference':>22} {before:>14} {t_ref * 1e3:>10.2f}")
+    for stage, (fn, repeat) in stages().items():
+        results[stage] = best_of(fn, repeat)
+        before = baseline.get(stage)
+        if before is None:
+            print(f"{stage:>22} {'-':>14} {results[stage] * 1e3:>10.2f}")
+            continue
+        # relative to the reference workload of each run
+        ratio = (results[stage] / t_ref) / (before / baseline["reference"])
+        if ratio > args.tolerance:
+            failed.append(stage)
+        flag = "  SLOWER" if ratio > args.tolerance else ""
+        print(f"{stage:>22} {before * 1e3:>14.2f} {results[stage] * 1e3:>10.2f} {ratio:>5.2f}x{flag}")
+    results["reference"] = min(t_ref, best_of(reference, 7))  # the machine may have changed pace meanwhile
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": f"{platform.machine()}, {os.cpu_count()} CPU, Python {platform.python_version()}",
+                       "seconds": results}, f, indent=2)
+            f.write("\n")
+        print(f"\nbaseline written to {args.baseline}")
+    elif failed:
+        print(f"\n{len(failed)} stage(s) more than {args.tolerance}x slower than the baseline: {', '.join(failed)}")
+        sys.exit(1)
+    elif not baseline:
+        print(f"\nno baseline at {args.baseline}: run with --update-baseline to record one")
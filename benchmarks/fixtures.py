@@ -0,0 +1,76 @@
+"""Synthetic glacier zips that mirror the member layout of the Zenodo archives.
+
+    python -m benchmarks.fixtures --out DIR [--archives 3] [--pathrows 4]
+"""
+import argparse
+import io
+import json
+import os
+import zipfile
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+PERCENTILE_FILES = [
+    "snowline_elev_percentile",
+    "melt_extent_elev_percentile",
+    "snowline_elev_percentile_eos_corr",
+    "melt_extent_elev_percentile_eos_corr",
+]
+
+
+def glacier_zip(rgi_no: str = "01.00570", n_pathrows: int = 4, n_bins: int = 60,
+                start: str = "2016-01-01", end: str = "2025-01-01", seed: int = 0) -> bytes:
+    """Inner {rgi_no}.zip with elevation- and area-bin CSVs for `n_pathrows` pathrows."""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range(start, end, freq="D")
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(n_pathrows):
+            pathrow = f"{100 + i}_{200 + i}"
+            dates = pd.date_range(start, end, freq="6D")
+            dates = dates[rng.random(len(dates)) > 0.2]  # missing acquisitions
+            for suffix, bins, name in [("", 1000 + 10.0 * np.arange(n_bins), "elev"),
+                                       ("_eabin", 0.05 + 0.1 * np.arange(n_bins), "area")]:
+                db = pd.DataFrame(rng.normal(-12, 4, (n_bins, len(dates))), index=bins,
+                                  columns=dates.strftime("%Y-%m-%d"))
+                zf.writestr(f"{rgi_no}_db_bin_mean_{pathrow}{suffix}.csv", db.to_csv())
+                hyps = pd.DataFrame({"area_m2": rng.uniform(1e4, 1e6, n_bins)}, index=bins)
+                zf.writestr(f"{rgi_no}_hypsometry_{pathrow}{suffix}.csv", hyps.to_csv())
+                for fname in PERCENTILE_FILES:
+                    series = pd.DataFrame({name: rng.uniform(bins[0], bins[-1], len(days))},
+                                          index=days.strftime("%Y-%m-%d"))
+                    zf.writestr(f"{rgi_no}_{fname}_{pathrow}{suffix}.csv", series.to_csv())
+    return buf.getvalue()
+
+
+def outer_zip(rgi_nos, n_pathrows: int = 4, **kwargs) -> bytes:
+    """Outer archive with an inner zip per glacier, stored as-is like the Zenodo archives."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+        for i, rgi_no in enumerate(rgi_nos):
+            zf.writestr(f"{rgi_no}.zip", glacier_zip(rgi_no, n_pathrows=n_pathrows, seed=i, **kwargs))
+    return buf.getvalue()
+
+
+def write_archives(out: str, n_archives: int = 3, n_pathrows: int = 4, links: str = os.path.join("data", "rgi_data_links.json")):
+    """Write the first `n_archives` outer archives of rgi_data_links.json, with all their glaciers, to `out`."""
+    with open(links, "r") as f:
+        groups = defaultdict(list)
+        for member, zip_name in json.load(f).items():
+            groups[zip_name].append(member[:-4])
+    os.makedirs(out, exist_ok=True)
+    for zip_name in sorted(groups)[:n_archives]:
+        with open(os.path.join(out, zip_name), "wb") as f:
+            f.write(outer_zip(sorted(groups[zip_name]), n_pathrows=n_pathrows))
+        print(f"{zip_name}: {len(groups[zip_name])} glaciers")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic outer archives in the Zenodo layout.")
+    parser.add_argument("--out", required=True, help="directory for the archives")
+    parser.add_argument("--archives", type=int, default=3, help="how many outer archives")
+    parser.add_argument("--pathrows", type=int, default=4, help="pathrows per glacier")
+    args = parser.parse_args()
+    write_archives(args.out, args.archives, args.pathrows)
@@ -0,0 +1,150 @@
+import streamlit as st
+import os
+import tempfile
+import time
+from snowlines.export import export_glaciers, group_by_archive, parse_rgi_numbers
+from snowlines import timing
+from snowlines.debug_panel import finish_page
+from snowlines.app_state import get_catalog
+# snowlines.catalog and snowlines.melt_metrics pull in pandas and numpy;
+# they are imported only when glaciers are selected by subregion or bounding box
+
+st.set_page_config(
+    page_title="Bulk download",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+
+def nav():
+    with st.sidebar:
+        st.title("Navigation")
+        st.page_link("https://alaskasnowlines.streamlit.app/", label="Home - glacier selection")
+        st.page_link("https://alaskasnowlines.streamlit.app/plot_elev", label="Heatmap - elevation bins")
+        st.page_link("https://alaskasnowlines.streamlit.app/plot_area", label="Heatmap - area bins")
+        st.page_link("https://alaskasnowlines.streamlit.app/plot_gif", label="Glacier animations")
+        st.page_link("https://alaskasnowlines.streamlit.app/compare", label="Compare glaciers")
+        st.page_link("https://alaskasnowlines.streamlit.app/melt_metrics", label="Regional melt metrics")
+        st.page_link("https://alaskasnowlines.streamlit.app/snowline_fractions", label="Regional snowline fractions")
+        st.page_link("https://alaskasnowlines.streamlit.app/bulk_export", label="Bulk download")
+nav()
+
+st.session_state["current_page"] = "bulk_export"
+timing_run = timing.start_run("bulk_export")
+# outside the disk cache, whose eviction would otherwise count and delete the zips
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "snowlines_exports")
+EXPORT_MAX_AGE = 6 * 3600  # seconds an export stays offered for download
+# the download button reads the whole zip into memory when clicked
+EXPORT_WARN_BYTES = 500 * 1024**2
+EXPORT_MAX_BYTES = 2 * 1024**3
+
+# ---------------- Glacier selections ----------------
+@st.cache_resource(show_spinner="Loading glacier subregions...")
+def get_subregion_glaciers():
+    """{subregion: [rgi_no, ...]} from the regional melt-extent table."""
+    from snowlines.melt_metrics import read_melt_metrics
+    from snowlines.search import rgi_no
+    df = read_melt_metrics()[["rgi_id", "subregion"]].drop_duplicates("rgi_id")
+    return {subregion: sorted(rgi_no(rid) for rid in group["rgi_id"])
+            for subregion, group in df.groupby("subregion", observed=True)}
+
+def remove_stale_exports(max_age: float = EXPORT_MAX_AGE):
+    """Delete exports older than `max_age` seconds, left behind by any session."""
+    cutoff = time.time() - max_age
+    for entry in os.scandir(EXPORT_DIR):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:  # removed by another session meanwhile
+            continue
+
+def read_export(path: str):
+    with open(path, "rb") as f:
+        return f.read()
+
+st.write("## Bulk download")
+st.write("Download the data of many glaciers as one zip with one `{rgi_no}.zip` per glacier. "
+         "Glaciers stored in the same Zenodo archive are read together.")
+
+mode = st.radio("Select glaciers by:", ["RGI numbers", "Subregion", "Bounding box"], horizontal=True)
+if mode == "RGI numbers":
+    text = st.text_area("RGI numbers (e.g. 01.00570, 00570 or RGI2000-v7.0-G-01-00570), separated by spaces, commas or lines:")
+    rgi_nos = parse_rgi_numbers(text)
+elif mode == "Subregion":
+    subregion_glaciers = get_subregion_glaciers()
+    subregions = st.multiselect("Subregions:", list(subregion_glaciers))
+    rgi_nos = [rgi_no for subregion in subregions for rgi_no in subregion_glaciers[subregion]]
+else:
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        lat_min = st.number_input("Latitude from:", min_value=50.0, max_value=72.0, value=60.0, format="%.4f")
+    with col2:
+        lat_max = st.number_input("Latitude to:", min_value=50.0, max_value=72.0, value=61.0, format="%.4f")
+    with col3:
+        lon_min = st.number_input("Longitude from:", min_value=-180.0, max_value=-125.0, value=-150.0, format="%.4f")
+    with col4:
+        lon_max = st.number_input("Longitude to:", min_value=-180.0, max_value=-125.0, value=-148.0, format="%.4f")
+    catalog = get_catalog()
+    inside = catalog["cenlat"].between(lat_min, lat_max) & catalog["cenlon"].between(lon_min, lon_max)
+    rgi_nos = [f"01.{rid[-5:]}" for rid in catalog.loc[inside, "rgi_id"]]
+
+groups, missing = group_by_archive(rgi_nos)
+n_glaciers = sum(len(members) for members in groups.values())
+if rgi_nos:
+    st.write(f"**{n_glaciers}** glaciers with data in **{len(groups)}** Zenodo archives"
+             + (f"; no data for {len(missing)}: {', '.join(missing[:20])}{' ...' if len(missing) > 20 else ''}" if missing else ""))
+
+# ---------------- Export ----------------
+if st.button("Prepare zip", disabled=not groups):
+    previous = st.session_state.pop("bulk_export", None)
+    if previous is not None and os.path.exists(previous["path"]):
+        os.remove(previous["path"])
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    remove_stale_exports()
+    fd, path = tempfile.mkstemp(dir=EXPORT_DIR, suffix=".zip")
+    bar = st.progress(0.0, text="Starting export...")
+    def report(done, total, rgi_no):
+        bar.progress(done / total, text=f"{done}/{total} glaciers ({rgi_no})")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            summary = export_glaciers(rgi_nos, f, report)
+    except BaseException:  # failed or interrupted: don't leave a partial zip behind
+        os.remove(path)
+        raise
+    bar.empty()
+    st.session_state["bulk_export"] = {"path": path, **summary}
+
+export = st.session_state.get("bulk_export")
+if export is not None and os.path.exists(export["path"]):
+    size = os.path.getsize(export["path"])
+    st.write(f"{len(export['written'])} glaciers in the zip ({size / 1e6:.1f} MB).")
+    for zip_name, error in export["failed"].items():
+        st.warning(f"Could not read {zip_name}, its glaciers are missing: {error}")
+    if size > EXPORT_MAX_BYTES:
+        st.error(f"The zip is larger than {EXPORT_MAX_BYTES / 1e9:.1f} GB, too large to download here. "
+                 "Select fewer glaciers, or run `python -m snowlines.export` locally.")
+    elif size > EXPORT_WARN_BYTES:
+        st.warning("This is a large download and may take a while to start.")
+    if size <= EXPORT_MAX_BYTES:
+        st.download_button(
+            label="Download glacier data (zip)",
+            data=lambda: read_export(export["path"]),
+            file_name=f"alaska_snowlines_{len(export['written'])}_glaciers.zip",
+            mime="application/zip",
+            on_click="ignore",
+        )
+
+st.markdown(
+    """
+    ---
+    <div style='text-align: center; font-size: 16px; color: gray;'>
+    Data courtesy of Albin Wells, David Rounce, and Mark Fahnestock<br>
+    Citation: Wells, A., Rounce, D., and Fahnestock, M. Seasonal progression of melt and snowlines 
+    in Alaska from SAR reveals impacts of warming. <i>npj Climate and Atmospheric Science</i> <b>9</b>, 
+    95 (2026). https://doi.org/10.1038/s41612-026-01321-y<br>
+    Correspondence: albin.wells@geo.uzh.ch
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+finish_page(timing_run)
@@ -0,0 +1,129 @@
+import streamlit as st
+import datetime
+from snowlines.export import parse_rgi_numbers
+from snowlines import timing
+from snowlines.debug_panel import finish_page
+from snowlines.app_state import get_catalog, get_locator
+# snowlines.compare/catalog/spatial pull in pandas and numpy;
+# they are imported once glaciers are chosen
+
+st.set_page_config(
+    page_title="Compare glaciers",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+
+def nav():
+    with st.sidebar:
+        st.title("Navigation")
+        st.page_link("https://alaskasnowlines.streamlit.app/", label="Home - glacier selection")
+        st.page_link("https://alaskasnowlines.streamlit.app/plot_elev", label="Heatmap - elevation bins")
+        st.page_link("https://alaskasnowlines.streamlit.app/plot_area", label="Heatmap - area bins")
+        st.page_link("https://alaskasnowlines.streamlit.app/plot_gif", label="Glacier animations")
+        st.page_link("https://alaskasnowlines.streamlit.app/compare", label="Compare glaciers")
+        st.page_link("https://alaskasnowlines.streamlit.app/melt_metrics", label="Regional melt metrics")
+        st.page_link("https://alaskasnowlines.streamlit.app/snowline_fractions", label="Regional snowline fractions")
+        st.page_link("https://alaskasnowlines.streamlit.app/bulk_export", label="Bulk download")
+nav()
+
+st.session_state["current_page"] = "compare"
+timing_run = timing.start_run("compare")
+MAX_GLACIERS = 10
+
+# ---------------- Glacier selections ----------------
+def glacier_label(rgi_no: str) -> str:
+    rgi_id = f"RGI2000-v7.0-G-01-{rgi_no[-5:]}"
+    catalog = get_catalog()
+    name = catalog.at[rgi_id, "glac_name"] if rgi_id in catalog.index else ""
+    return f"{name} ({rgi_no})" if name else rgi_no
+
+# archive reads and parses of all sessions share one pool
+@st.cache_resource
+def get_load_pool():
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="compare")
+
+# all glaciers at once: archives are read concurrently, shared archives in one pass,
+# and each dataset lands in the same process-wide cache the heatmap pages use
+def load_glaciers(rgi_nos):
+    from snowlines.compare import load_datasets
+    with st.spinner(f"Fetching data of {len(rgi_nos)} glaciers..."):
+        return load_datasets(rgi_nos, get_load_pool())
+
+st.write("## Compare glaciers")
+st.write("Snowline and melt-extent elevations of several glaciers on one time axis, "
+         "averaged over the SAR pathrows that see each glacier.")
+
+mode = st.radio("Select glaciers by:", ["RGI numbers", "Nearest to a coordinate"], horizontal=True)
+if mode == "RGI numbers":
+    text = st.text_input("RGI numbers (e.g. 01.00570, 00570 or RGI2000-v7.0-G-01-00570), separated by spaces or commas:")
+    rgi_nos = parse_rgi_numbers(text)
+else:
+    col1, col2, col3, col4 = st.columns([2, 2, 2, 3])
+    with col1:
+        lat = st.number_input("Latitude:", min_value=50.0, max_value=72.0, value=63.28, format="%.4f")
+    with col2:
+        lon = st.number_input("Longitude:", min_value=-180.0, max_value=-125.0, value=-145.42, format="%.4f")
+    with col3:
+        k = st.number_input("Glaciers:", min_value=2, max_value=MAX_GLACIERS, value=5)
+    with col4:
+        to = st.radio("Distance to", ["centroid", "terminus", "either"], horizontal=True)
+    rgi_nos = [f"01.{rgi_id[-5:]}" for rgi_id, _, _ in get_locator().nearest(lat, lon, int(k), to=to)]
+
+if len(rgi_nos) > MAX_GLACIERS:
+    st.warning(f"Comparing the first {MAX_GLACIERS} of {len(rgi_nos)} glaciers.")
+    rgi_nos = rgi_nos[:MAX_GLACIERS]
+
+# ---------------- Plot ----------------
+if rgi_nos:
+    from snowlines.compare import SERIES, downsampled, series_matrix
+
+    datasets, failed = load_glaciers(rgi_nos)
+    for name, error in failed.items():
+        if name.endswith(".zip"):
+            st.warning(f"Could not read {name}, its glaciers are missing: {error}")
+        else:
+            st.warning(f"Could not read the data of {name}: {error}")
+    with_data = {rgi_no: dataset for rgi_no, dataset in datasets.items() if dataset is not None}
+    no_data = [rgi_no for rgi_no, dataset in datasets.items() if dataset is None]
+    if no_data:
+        st.info(f"No snowline data for {', '.join(no_data)}.")
+
+    if with_data:
+        col1, col2 = st.columns(2)
+        with col1:
+            use_eos_corr = st.toggle("Apply end-of-summer correction", value=False)
+        with col2:
+            relative = st.toggle("Relative to each glacier's elevation range", value=False)
+        start, end = st.slider("Dates:", min_value=datetime.date(2016, 1, 1), max_value=datetime.date(2025, 1, 1),
+                               value=(datetime.date(2017, 1, 1), datetime.date(2025, 1, 1)), format="YYYY-MM-DD")
+
+        labels = [glacier_label(rgi_no) for rgi_no in with_data]
+        for field, name in SERIES.items():
+            y_label = f"{name} (0 = glacier bottom, 1 = top)" if relative else f"{name} [m a.s.l.]"
+            dates, matrix = series_matrix(with_data, field, eos_corr=use_eos_corr, relative=relative)
+            st.write(f"#### {name}")
+            st.line_chart(downsampled(dates, matrix, labels, y_label, start, end),
+                          x="date", y=y_label, color="glacier", height=400)
+        st.caption("Each line is the daily mean over the glacier's pathrows, downsampled to about one point per pixel column.")
+        st.write("Heatmaps: " + " · ".join(
+            f"[{label}](https://alaskasnowlines.streamlit.app/plot_elev?rgi_no={rgi_no})"
+            for rgi_no, label in zip(with_data, labels)))
+else:
+    st.info("Enter RGI numbers or a coordinate to compare glaciers.")
+
+st.markdown(
+    """
+    ---
+    <div style='text-align: center; font-size: 16px; color: gray;'>
+    Data courtesy of Albin Wells, David Rounce, and Mark Fahnestock<br>
+    Citation: Wells, A., Rounce, D., and Fahnestock, M. Seasonal progression of melt and snowlines
+    in Alaska from SAR reveals impacts of warming. <i>npj Climate and Atmospheric Science</i> <b>9</b>,
+    95 (2026). https://doi.org/10.1038/s41612-026-01321-y<br>
+    Correspondence: albin.wells@geo.uzh.ch
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+finish_page(timing_run)
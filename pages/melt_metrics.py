@@ -0,0 +1,124 @@
+import streamlit as st
+from snowlines.melt_metrics import METRICS, MeltCube
+from snowlines import timing
+from snowlines.debug_panel import finish_page
+
+st.set_page_config(
+    page_title="Regional melt metrics",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+
+def nav():
+    with st.sidebar:
+        st.title("Navigation")
+        st.page_link("https://alaskasnowlines.streamlit.app/", label="Home - glacier selection")
+        st.page_link("https://alaskasnowlines.streamlit.app/plot_elev", label="Heatmap - elevation bins")
+        st.page_link("https://alaskasnowlines.streamlit.app/plot_area", label="Heatmap - area bins")
+        st.page_link("https://alaskasnowlines.streamlit.app/plot_gif", label="Glacier animations")
+        st.page_link("https://alaskasnowlines.streamlit.app/compare", label="Compare glaciers")
+        st.page_link("https://alaskasnowlines.streamlit.app/melt_metrics", label="Regional melt metrics")
+        st.page_link("https://alaskasnowlines.streamlit.app/snowline_fractions", label="Regional snowline fractions")
+        st.page_link("https://alaskasnowlines.streamlit.app/bulk_export", label="Bulk download")
+nav()
+
+st.session_state["current_page"] = "melt_metrics"
+timing_run = timing.start_run("melt_metrics")
+
+# ---------------- Load melt metrics ----------------
+# table and aggregation cube built once per process and shared by all sessions
+@st.cache_resource(show_spinner="Loading regional melt metrics...")
+def get_melt_cube():
+    return MeltCube.from_bundle()
+
+cube = get_melt_cube()
+GROUPINGS = {
+    "Subregion": ("subregion",),
+    "Year": ("year",),
+    "Subregion and year": ("subregion", "year"),
+    "Year and SAR direction": ("year", "direction"),
+}
+
+st.write("## Regional melt metrics")
+st.write("Annual melt extent metrics of individual glaciers, averaged by glacier area.")
+
+# ---------------- Filters ----------------
+col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
+with col1:
+    subregions = st.multiselect("Subregions:", cube.subregions, placeholder="All subregions")
+with col2:
+    years = st.slider("Years:", min_value=cube.years[0], max_value=cube.years[-1], value=(cube.years[0], cube.years[-1]))
+with col3:
+    direction = st.radio("SAR direction:", ["Both", *cube.directions], horizontal=True)
+with col4:
+    metric = st.selectbox("Metric:", list(METRICS), format_func=METRICS.get)
+grouping = st.radio("Group by:", list(GROUPINGS), horizontal=True)
+
+filters = dict(
+    subregions=subregions or None,
+    years=range(years[0], years[1] + 1),
+    directions=None if direction == "Both" else [direction],
+)
+by = GROUPINGS[grouping]
+table = cube.table(metric, by, **filters)
+
+# ---------------- Aggregated view ----------------
+if table.empty:
+    st.error("No melt metrics for this selection.")
+else:
+    if by == ("subregion",):
+        st.bar_chart(table.set_index("subregion")[metric], y_label=METRICS[metric])
+    elif by == ("year",):
+        st.line_chart(table.set_index("year")[metric], y_label=METRICS[metric])
+    else:
+        st.line_chart(table.pivot(index="year", columns=by[0] if by[0] != "year" else by[1], values=metric),
+                      y_label=METRICS[metric])
+    st.dataframe(
+        table,
+        hide_index=True,
+        column_config={
+            metric: st.column_config.NumberColumn(METRICS[metric], format="%.1f"),
+            "area_km2": st.column_config.NumberColumn("Glacier area [km²]", format="%.0f"),
+            "rows": st.column_config.NumberColumn("Glacier-pathrow records"),
+        },
+    )
+
+# ---------------- Drill-down to glaciers ----------------
+st.write("### Glaciers")
+col1, col2 = st.columns(2)
+with col1:
+    drill_subregion = st.selectbox("Subregion:", cube.subregions)
+with col2:
+    drill_year = st.selectbox("Year:", cube.years[::-1])
+rows = cube.cell_rows([drill_subregion], [drill_year], filters["directions"])
+if rows.empty:
+    st.info(f"No {direction.lower()} SAR observations in {drill_subregion} in {drill_year}." if direction != "Both"
+            else f"No observations in {drill_subregion} in {drill_year}.")
+else:
+    rows = rows.assign(plot=[f"https://alaskasnowlines.streamlit.app/plot_elev?rgi_no=01.{rgi_id[-5:]}" for rgi_id in rows["rgi_id"]])
+    st.dataframe(
+        rows[["rgi_id", "plot", "area_km2", "direction", "pathrow", "obs_per_yr", *METRICS]],
+        hide_index=True,
+        column_config={
+            "plot": st.column_config.LinkColumn("Heatmap", display_text="Plot"),
+            "area_km2": st.column_config.NumberColumn("Area [km²]", format="%.1f"),
+            "obs_per_yr": st.column_config.NumberColumn("Scenes"),
+            **{m: st.column_config.NumberColumn(label, format="%.1f") for m, label in METRICS.items()},
+        },
+    )
+
+st.markdown(
+    """
+    ---
+    <div style='text-align: center; font-size: 16px; color: gray;'>
+    Data courtesy of Albin Wells, David Rounce, and Mark Fahnestock<br>
+    Citation: Wells, A., Rounce, D., and Fahnestock, M. Seasonal progression of melt and snowlines 
+    in Alaska from SAR reveals impacts of warming. <i>npj Climate and Atmospheric Science</i> <b>9</b>, 
+    95 (2026). https://doi.org/10.1038/s41612-026-01321-y<br>
+    Correspondence: albin.wells@geo.uzh.ch
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+finish_page(timing_run)
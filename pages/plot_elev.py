@@ -1,11 +1,13 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import json
 import datetime
-import threading
-import requests, zipfile, io, os, sys
-import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from snowlines.figcache import FigureCache
+from snowlines.zenodo import fetch_glacier_zip
+from snowlines import timing
+from snowlines.debug_panel import finish_page
+from snowlines.app_state import get_search_index
+# snowlines.catalog/search/dataset/plotting/interactive pull in pandas, numpy and matplotlib;
+# they are imported where first used so the page renders before a glacier is chosen
 
 st.set_page_config(
     page_title="Plot (equal elevation bins)",
@@ -20,141 +22,42 @@ def nav():
         st.page_link("https://alaskasnowlines.streamlit.app/plot_elev", label="Heatmap - elevation bins")
         st.page_link("https://alaskasnowlines.streamlit.app/plot_area", label="Heatmap - area bins")
         st.page_link("https://alaskasnowlines.streamlit.app/plot_gif", label="Glacier animations")
+        st.page_link("https://alaskasnowlines.streamlit.app/compare", label="Compare glaciers")
+        st.page_link("https://alaskasnowlines.streamlit.app/melt_metrics", label="Regional melt metrics")
+        st.page_link("https://alaskasnowlines.streamlit.app/snowline_fractions", label="Regional snowline fractions")
+        st.page_link("https://alaskasnowlines.streamlit.app/bulk_export", label="Bulk download")
 nav()
 
 st.session_state["current_page"] = "plot_elev"
-
-mpl_lock = threading.Lock()
-
-# ---------------- plotting functions ----------------
-def plot_db_heatmap(db_bin, dates, bins_center, binned_area, set_ymin, set_ymax, glacno, cmap='RdYlBu', 
-                    cbar_label='Backscatter [dB]', ylabel='Elevation [m a.s.l.]', glac_name_dict={}, figsize=(9,6), 
-                    bins2plot_lowerquantile=2, bins2plot_upperquantile=98, frame_cut=0, title_info='', **kwargs):
-    """" Heatmap plotting function """
-    fig, ax = plt.subplots(figsize=figsize)
-
-    try:
-        dates_12d = pd.date_range(dates[frame_cut], dates[-1], freq='12D')
-    except:
-        return f"Dates exceed data bounds for glacier {glacno+title_info}"
-
-    dates_12d_str = [x.strftime('%Y%m%d') for x in dates_12d]
-    db_bin_12d = np.zeros((db_bin.shape[0], len(dates_12d)))
-    db_bin_12d[:] = np.nan
-    dates_str = []
-    for ndate, date in enumerate(dates_12d_str):
-        date_np = np.datetime64(f'{date[:4]}-{date[4:6]}-{date[6:]}').astype('datetime64[ns]')
-        if date_np in dates:
-            date_idx = np.where(dates == date_np)[0][0]
-            db_bin_12d[:,ndate] = db_bin[:,date_idx]
-            dates_str.append(date)
-
-    dbmin = np.nanpercentile(db_bin, 2)
-    dbmax = np.nanpercentile(db_bin, 98)
-
-    bin_sizes = np.diff(bins_center)
-    bin_halfsize = bin_sizes[0]/2
-    if ylabel == 'Elevation [m a.s.l.]':
-        assert np.all(bin_sizes == bin_sizes[0]) == True, 'Elevation bins are not regularly spaced.'
-
-    cax = ax.imshow(db_bin_12d, cmap=cmap, vmin=dbmin, vmax=dbmax, interpolation='nearest', aspect='auto', 
-                    origin='lower', extent=[dates_12d[0], dates_12d[-1], set_ymin, set_ymax])
-
-    # plot additional data from **kwargs
-    line_plot = kwargs.get('line_plot', [])
-    if line_plot:
-        for data in line_plot:
-            x, y, c, ls, lw, label = data
-            ax.plot(x, y, c=c, ls=ls, lw=lw, label=label)
-        ax.legend(loc='lower right')
-
-    # label by glacier number or name, if available
-    if glacno in glac_name_dict.keys():
-        glac_name = glac_name_dict[glacno]
-    else:
-        glac_name = str(glacno)
-    ax.set_title(glac_name+title_info)
-    ax.set_ylabel(ylabel)
-    ax.set_xlim([dates_12d[0], dates_12d[-1]])
-    ax.set_ylim([set_ymin, set_ymax])
-    cbar = fig.colorbar(cax, orientation='vertical', label=cbar_label)
-
-    return fig
+timing_run = timing.start_run("plot_elev")
 
 # ---------------- Fetch glacier snowline + melt CSVs ----------------
-@st.cache_data(show_spinner="Fetching glacier data...", ttl=24*3600)
-def fetch_snowline_data(rgi_no: str, use_eos_corr: bool = False):
-    """Fetch snowline and melt extent CSVs for a given glacier number."""
-    json_path = os.path.join("data", "rgi_data_links.json")
-    with open(json_path, "r") as f:
-        rgi_index = json.load(f)
-    
-    rgi_key = (rgi_no + ".zip").strip()
-    try:
-        zip_name = rgi_index[rgi_key]
-    except:
-        st.error(f"No data found for gacier {rgi_no}.")
-        sys.exit()
-    zip_url = f"https://zenodo.org/records/17573252/files/{zip_name}?download=1"
-    
-    # Download the outer zip
-    response = requests.get(zip_url)
-    response.raise_for_status()
-
-    sl_list, me_list, db_list, hyps_list, pr_list = [], [], [], [], []
-
-    with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
-        file_name = f"{rgi_no}.zip"
-        if file_name not in zf.namelist():
-            return None, None, None, None, None
-
-        # Extract inner ZIP as bytes
-        with zf.open(file_name) as inner_zip_file:
-            with zipfile.ZipFile(inner_zip_file) as gzf:
-                for fname in gzf.namelist():
-                    if "snowline_elev_percentile" in fname and "eos_corr" not in fname and "eabin" not in fname:
-                        if use_eos_corr:
-                            sl_list.append(gzf.read(fname.replace("percentile", "percentile_eos_corr")).decode())
-                            me_list.append(gzf.read(fname.replace("snowline_elev_percentile", "melt_extent_elev_percentile_eos_corr")).decode())
-                        else:
-                            sl_list.append(gzf.read(fname).decode())
-                            me_list.append(gzf.read(fname.replace("snowline", "melt_extent")).decode())
-                        db_list.append(gzf.read(fname.replace("snowline_elev_percentile", "db_bin_mean")).decode())
-                        hyps_list.append(gzf.read(fname.replace("snowline_elev_percentile", "hypsometry")).decode())
-                        pr_list.append(fname.split("_snowline_elev_percentile_")[-1][:-4])
-
-    return sl_list, me_list, db_list, hyps_list, pr_list
-
-@st.cache_data(show_spinner="Accessing data downloading options...", ttl=24*3600)
+# one dataset per glacier (both bin variants, raw and corrected percentiles), parsed from a single
+# fetch and shared with the other heatmap page and all sessions: the correction toggle is a lookup
+def load_pathrows(rgi_no: str, use_eos_corr: bool = False):
+    """Per-pathrow arrays (elevation bins) of the glacier's shared dataset, or None without data."""
+    from snowlines.dataset import get_dataset
+    dataset = get_dataset(rgi_no)
+    return None if dataset is None else dataset.pathrows("elev", eos_corr=use_eos_corr)
+
+def has_eos_corr(rgi_no: str) -> bool:
+    """Whether the glacier has end-of-summer corrected series to toggle to."""
+    from snowlines.dataset import get_dataset
+    dataset = get_dataset(rgi_no)
+    return dataset is not None and dataset.has_eos_corr("elev")
+
+# the download button gets a callable: Streamlit runs it on click only, so page views
+# that never download don't fetch the zip (it comes from the disk cache or one range read)
 def download_data(rgi_no: str):
-    """Fetch only the inner rgi_no.zip from the outer ZIP on Zenodo."""
-    # Load JSON mapping
-    json_path = os.path.join("data", "rgi_data_links.json")
-    with open(json_path, "r") as f:
-        rgi_index = json.load(f)
-    
-    rgi_key = (rgi_no + ".zip").strip()
-    zip_name = rgi_index.get(rgi_key)
-    if zip_name is None:
-        st.error(f"No data found for glacier {rgi_no}.")
-        sys.exit()
-
-    # Download the outer ZIP
-    zip_url = f"https://zenodo.org/records/17573252/files/{zip_name}?download=1"
-    response = requests.get(zip_url)
-    response.raise_for_status()
+    """Deferred payload of the inner rgi_no.zip for st.download_button."""
+    def read():
+        inner_zip_bytes = fetch_glacier_zip(rgi_no)
+        if inner_zip_bytes is None:
+            raise FileNotFoundError(f"No inner ZIP for glacier {rgi_no} found in outer ZIP.")
+        return inner_zip_bytes
+    return read
 
-    # Extract the inner rgi_no.zip from the outer ZIP
-    with zipfile.ZipFile(io.BytesIO(response.content)) as outer_zip:
-        if f"{rgi_no}.zip" not in outer_zip.namelist():
-            st.error(f"No inner ZIP for glacier {rgi_no} found in outer ZIP.")
-            return None
-        with outer_zip.open(f"{rgi_no}.zip") as inner_zip_file:
-            inner_zip_bytes = inner_zip_file.read()  # read inner ZIP bytes
-    return inner_zip_bytes
-    
 # ---------------- Main page ----------------
-gdf = st.session_state.get("gdf", None)
 query_params = st.query_params
 rgi_no_map = query_params.get("rgi_no", None)
 rgi_no_man = None
@@ -162,50 +65,51 @@ rgi_no_man = None
 # Allow manual input
 manual_input = st.text_input("Enter a glacier name or RGI number:")
 
-if manual_input is not None:
-    if gdf is None:
-        with st.spinner("Loading glacier outlines..."):
-            def load_glaciers(url):
-                gdf = pd.read_csv(csv_path)
-                return gdf
-        
-        # Load glaciers
-        csv_path = os.path.join("data", "RGI2000-v7.0-G-01_alaska_2km2.csv")
-        gdf = load_glaciers(csv_path)
-        gdf = gdf[gdf["area_km2"] > 2].copy()
-        gdf = gdf[~gdf["glac_name"].str.contains("_abl", case=False, na=False)].copy()
+if manual_input:
+    index = get_search_index()
+    matches = index.search(manual_input)
 
-    # Case-insensitive substring match on rgi_id or glac_name
-    matches = gdf[
-        gdf["rgi_id"].str.contains(manual_input, case=False, na=False) |
-        gdf["glac_name"].str.contains(manual_input, case=False, na=False)
-    ]
-
-    if not matches.empty and len(matches) < 100:
+    if matches and len(matches) < 100:
         if len(matches) == 1:
             st.info(f"Found {len(matches)} possible match.")
         else:
             st.info(f"Found {len(matches)} possible matches. Please choose one:")
-        selected = st.selectbox(
-            "Select glacier:",
-            matches["rgi_id"],
-            format_func=lambda rid: f"{rid} – {matches.loc[matches['rgi_id']==rid, 'glac_name'].values[0]}"
-        )
+        selected = st.selectbox("Select glacier:", matches, format_func=index.label)
         rgi_no_man = "01." + selected[-5:]
     else:
-        if matches.empty:
+        if not matches:
             st.error("No matching glacier found.")
 
-# ---------------- filter date range ----------------
-def dates_filter_for_plotting(df, date_start='2017-01-01', date_end='2025-01-01'):
-    df.columns = pd.to_datetime(df.columns)
-    df_filt = df.loc[:, (df.columns >= date_start) & (df.columns < date_end)]
-    return df_filt
+# rendered heatmaps shared by all sessions
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
+# pathrows of a glacier are rendered concurrently on Agg figures, no pyplot involved
+@st.cache_resource
+def get_render_pool():
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="heatmap")
+
+# whole record per pathrow, zoomed and filtered in the browser without reruns
+@st.cache_data(show_spinner="Preparing interactive heatmaps...", ttl=24*3600, max_entries=64)
+def interactive_heatmaps(rgi_no: str):
+    from snowlines.interactive import heatmap_html, heatmap_payload
+    pathrows = load_pathrows(rgi_no)
+    if pathrows is None:
+        return None
+    eos_pathrows = load_pathrows(rgi_no, use_eos_corr=True)
+    payloads = [heatmap_payload(data, rgi_no, variant="elev", eos_data=eos_data)
+                for data, eos_data in zip(pathrows, eos_pathrows)]
+    return [heatmap_html(payload) for payload in payloads if payload is not None] or None  # pathrows without dates are skipped
+
+interactive = st.toggle("Interactive heatmap (zoom and pan in the browser)", value=False)
 
 default_start = datetime.date(2017, 1, 1)
 default_end = datetime.date(2025, 1, 1)
-date_range = st.slider("Select plot date range:", min_value=datetime.date(2016, 1, 1), max_value=datetime.date(2025, 1, 1),
-                       value=(default_start, default_end), format="YYYY-MM-DD")
+date_range = (default_start, default_end)
+if not interactive:
+    date_range = st.slider("Select plot date range:", min_value=datetime.date(2016, 1, 1), max_value=datetime.date(2025, 1, 1),
+                           value=(default_start, default_end), format="YYYY-MM-DD")
 date_start, date_end = date_range[0].strftime("%Y-%m-%d"), date_range[1].strftime("%Y-%m-%d")
 
 # plot data
@@ -214,57 +118,60 @@ if rgi_no is None:
     # st.warning("No glacier selected. Go back to the map and click a glacier.")
     st.page_link("app.py", label="No glacier selected. Go back to the map selection or enter a glacier above.")
 else:
-    with st.container():
-        use_eos_corr = st.toggle("Apply end-of-summer correction", value=False)
-        
+    use_eos_corr = False
+    if not interactive:
+        with st.spinner("Fetching glacier data..."):
+            show_eos_toggle = has_eos_corr(rgi_no)
+        if show_eos_toggle:
+            with st.container():
+                use_eos_corr = st.toggle("Apply end-of-summer correction", value=False)
+
     st.write(f"### Data for RGI v7: {rgi_no}")
-    sl_dfs, me_dfs, db_dfs, hyps_dfs, prs = fetch_snowline_data(rgi_no, use_eos_corr=use_eos_corr)
+    fig_cache = get_figure_cache()
+    # the spinner stays out here: interactive_heatmaps is st.cache_data and must not hold UI elements
+    with st.spinner("Fetching glacier data..."):
+        pathrows = interactive_heatmaps(rgi_no) if interactive else load_pathrows(rgi_no, use_eos_corr=use_eos_corr)
 
-    if sl_dfs is None:
+    if pathrows is None:
         st.error("No snowline data found for this glacier.")
+    elif interactive:
+        for html in pathrows:
+            st.iframe(html, height=430)
     else:
-        for sl_df, me_df, db_df, hyps_df, pr in zip(sl_dfs, me_dfs, db_dfs, hyps_dfs, prs):
-            with st.spinner("Generating plots..."):
-                sl_df = pd.read_csv(io.StringIO(sl_df), index_col=0)
-                sl_df.index = pd.to_datetime(sl_df.index, format='%Y-%m-%d')
-                me_df = pd.read_csv(io.StringIO(me_df), index_col=0)
-                me_df.index = pd.to_datetime(me_df.index, format='%Y-%m-%d')
-                db_df = pd.read_csv(io.StringIO(db_df), index_col=0)
-                db_df = dates_filter_for_plotting(db_df, date_start=date_start, date_end=date_end)
-                hyps_df = pd.read_csv(io.StringIO(hyps_df), index_col=0)
-                
-                glac_zbins_center = np.array(hyps_df.index.tolist())
-                glac_bin_sizes = np.diff(glac_zbins_center)
-                glac_bin_halfsize = glac_bin_sizes[0]/2
-                binned_area = np.array(hyps_df.iloc[:, 0].tolist())
-                set_ymin, set_ymax = glac_zbins_center[0]-glac_bin_halfsize, glac_zbins_center[-1]+glac_bin_halfsize
-    
-                dates = np.array(db_df.columns.tolist()).astype('datetime64[ns]')
-                glac_binned_data = np.array(db_df.to_numpy())
-            
-                dates_per = np.array(me_df.index.tolist()).astype('datetime64[ns]')
-                me_elev_per = np.array(me_df.iloc[:, 0].tolist())
-                dates_sl_per = np.array(sl_df.index.tolist()).astype('datetime64[ns]')
-                sl_elev_per = np.array(sl_df.iloc[:, 0].tolist())
-    
-                # ---------------- Plot ----------------
-                with mpl_lock:
-                    fig = plot_db_heatmap(db_bin=glac_binned_data,  dates=dates, dates_me=dates_per, dates_sl=dates_sl_per, 
-                                          bins_center=glac_zbins_center, binned_area=binned_area, set_ymin=set_ymin, set_ymax=set_ymax,
-                                          glacno=rgi_no, title_info=f" (pathrow: {pr})", figsize=(12, 4), 
-                                          line_plot=[(dates_per, me_elev_per, 'k', '-', 0.7, 'Melt extent'),
-                                                     (dates_sl_per, sl_elev_per, 'k', '-.', 0.7, 'Snowline')])
-                    if isinstance(fig, str):
-                        st.write(fig)
-                        continue
-                st.pyplot(fig)
-
+        from snowlines.plotting import render_pathrow
+
+        # one placeholder per pathrow keeps the page order; figures fill in as they finish
+        render_pool = get_render_pool()
+        jobs = {}
+        for data in pathrows:
+            slot = st.empty()
+            fig_key = (rgi_no, data["pathrow"], date_start, date_end, use_eos_corr, "elev")
+            png = fig_cache.get(fig_key)
+            if png is not None:
+                slot.image(png, width="stretch")
+                continue
+            job = timing.submit(render_pool, render_pathrow, data, rgi_no, variant="elev",
+                                date_start=date_start, date_end=date_end)
+            jobs[job] = (slot, fig_key)
+
+        with st.spinner("Generating plots..."):
+            for job in as_completed(jobs):
+                slot, fig_key = jobs[job]
+                png = job.result()
+                if isinstance(png, str):
+                    slot.write(png)
+                    continue
+                fig_cache.put(fig_key, png)
+                slot.image(png, width="stretch")
+
+    if pathrows is not None:
         # download button
         st.download_button(
             label="Download raw data files",
-            data=download_data(rgi_no),  # fetch bytes directly here
+            data=download_data(rgi_no),  # fetched when clicked
             file_name=f"{rgi_no}.zip",
-            mime="application/zip"
+            mime="application/zip",
+            on_click="ignore"
         )
 
 st.markdown(
@@ -280,3 +187,5 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
+
+finish_page(timing_run, figure_cache=get_figure_cache())
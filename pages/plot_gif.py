@@ -1,7 +1,10 @@
 import streamlit as st
-import geopandas as gpd
-import pandas as pd
-import requests, zipfile, io, os
+import zipfile, io
+from snowlines.zenodo import animation_url, fetch_animation_zip
+from snowlines import timing
+from snowlines.debug_panel import finish_page
+from snowlines.app_state import get_search_index
+# snowlines.catalog/search pull in pandas and numpy; they are imported when a search is typed
 
 st.set_page_config(
     page_title="Animation",
@@ -16,6 +19,10 @@ def nav():
         st.page_link("https://alaskasnowlines.streamlit.app/plot_elev", label="Heatmap - elevation bins")
         st.page_link("https://alaskasnowlines.streamlit.app/plot_area", label="Heatmap - area bins")
         st.page_link("https://alaskasnowlines.streamlit.app/plot_gif", label="Glacier animations")
+        st.page_link("https://alaskasnowlines.streamlit.app/compare", label="Compare glaciers")
+        st.page_link("https://alaskasnowlines.streamlit.app/melt_metrics", label="Regional melt metrics")
+        st.page_link("https://alaskasnowlines.streamlit.app/snowline_fractions", label="Regional snowline fractions")
+        st.page_link("https://alaskasnowlines.streamlit.app/bulk_export", label="Bulk download")
 nav()
 
 # hide_sidebar_style = """
@@ -26,9 +33,9 @@ nav()
 # """
 # st.markdown(hide_sidebar_style, unsafe_allow_html=True)
 st.session_state["current_page"] = "animation"
+timing_run = timing.start_run("animation")
 
 # ---------------- Main page ----------------
-gdf = st.session_state.get("gdf", None)
 query_params = st.query_params
 rgi_no_map = query_params.get("name", None)
 rgi_id_map = query_params.get("rgi_id", None)
@@ -37,59 +44,25 @@ rgi_no_man, rgi_id_man = None, None
 # Allow manual input
 manual_input = st.text_input("Enter a glacier name (e.g., Kennicott):")
 
-if manual_input is not None:
-    if gdf is None:  
-        with st.spinner("Loading glacier outlines..."):
-            def load_glaciers(url):
-                gdf = pd.read_csv(csv_path)
-                return gdf
-        
-        # Load glaciers
-        csv_path = os.path.join("data", "RGI2000-v7.0-G-01_alaska_2km2.csv")
-        gdf = load_glaciers(csv_path)
-        gdf = gdf[gdf["area_km2"] > 2].copy()
-        gdf = gdf[~gdf["glac_name"].str.contains("_abl", case=False, na=False)].copy()
-            
-    # Case-insensitive substring match on rgi_id or glac_name
-    matches = gdf[
-        gdf["rgi_id"].str.contains(manual_input, case=False, na=False) |
-        gdf["glac_name"].str.contains(manual_input, case=False, na=False)
-    ]
+if manual_input:
+    index = get_search_index()
+    matches = index.search(manual_input)
 
-    if not matches.empty and len(matches) < 100:
+    if matches and len(matches) < 100:
         if len(matches) == 1:
             st.info(f"Found {len(matches)} possible match.")
         else:
             st.info(f"Found {len(matches)} possible matches. Please choose one:")
             
-        options = list(zip(matches["rgi_id"], matches["glac_name"]))
-        selected = st.selectbox(
-            "Select glacier:",
-            options,
-            format_func=lambda opt: f"{opt[0]} – {opt[1]}"
-        )
+        selected = st.selectbox("Select glacier:", matches, format_func=index.label)
         
-        rgi_id_man, rgi_no_man = selected
-        rgi_id_man = rgi_id_man[-5:]
-        rgi_no_man = rgi_no_man.replace(" Glacier", "").replace("_abl", "").strip()
+        rgi_id_man = selected[-5:]
+        rgi_no_man = index.name(selected).replace(" Glacier", "").replace("_abl", "").strip()
         rgi_no_man = rgi_no_man.replace("/", "-")
     else:
-        if matches.empty:
+        if not matches:
             st.error("No matching glacier found.")
 
-# @st.cache_data(show_spinner="Accessing data downloading options...", ttl=300)
-def export_gif(url: str):
-    response = requests.get(url)
-    response.raise_for_status()
-    return response.content
-    
-# @st.cache_data(show_spinner="Downloading animation...", ttl=30)
-def download_gif_zip(url: str):
-    response = requests.get(url)
-    response.raise_for_status()
-    return io.BytesIO(response.content)
-
-# @st.cache_data(show_spinner="Loading animation...", ttl=24*3600)
 def get_animation_html(zip_bytes, rgi_no: str):
     with zipfile.ZipFile(zip_bytes) as zf:
         matching_files = [f for f in zf.namelist() if f.startswith(f"{rgi_no}") and f.endswith("_animation.html")]
@@ -100,48 +73,47 @@ def get_animation_html(zip_bytes, rgi_no: str):
             pathrow = fname.split(f"{rgi_no}_")[1].split("_animation")[0]
             result.append((pathrow, html_content))
         return result
-            
+
+# one fetch per glacier, shared by all sessions; only the parsed pages are kept in memory,
+# the zip itself stays in the disk cache for the download button
+@st.cache_resource(show_spinner="Loading animation...", ttl=24*3600, max_entries=32)
+def load_animation(rgi_no: str, rgi_id: str):
+    """Fetch the animation zip once and return the parsed (pathrow, html) pairs."""
+    gif_zip_fp = animation_url(rgi_no, rgi_id)
+    if gif_zip_fp is None:
+        return []
+    zip_bytes = fetch_animation_zip(gif_zip_fp)
+    with timing.span("unzip"):
+        return get_animation_html(io.BytesIO(zip_bytes), rgi_no)
+
 # ---------------- show animation ----------------
 rgi_no = rgi_no_man if rgi_no_man is not None else rgi_no_map
 rgi_id = rgi_id_man if rgi_id_man is not None else rgi_id_map
 if rgi_no is None:
     st.page_link("app.py", label="No glacier selected. Go back to the map selection or enter a glacier above.")
 else:
-    st.write(f"### Animation for {rgi_no} Glacier (01.{rgi_id})")
+    # unnamed glaciers have an empty name: title them by their RGI number
+    title = f"{rgi_no} Glacier (01.{rgi_id})" if rgi_no else f"glacier 01.{rgi_id}"
+    st.write(f"### Animation for {title}")
+
+    animations = load_animation(rgi_no, rgi_id)
 
-    if (ord(rgi_no[0]) >= 65) and (ord(rgi_no[0]) < 68): # from A thru C
-        gif_zip_fp = f"https://zenodo.org/records/17096302/files/{rgi_no}_{rgi_id}.zip?download=1"
-    elif (ord(rgi_no[0]) >= 68) and (ord(rgi_no[0]) < 72): # from D thru G
-        gif_zip_fp = f"https://zenodo.org/records/17096311/files/{rgi_no}_{rgi_id}.zip?download=1"
-    elif (ord(rgi_no[0]) >= 72) and (ord(rgi_no[0]) < 77): # from H thru L
-        gif_zip_fp = f"https://zenodo.org/records/17096339/files/{rgi_no}_{rgi_id}.zip?download=1"
-    elif (ord(rgi_no[0]) >= 77) and (ord(rgi_no[0]) < 83): # from M thru R
-        gif_zip_fp = f"https://zenodo.org/records/17096340/files/{rgi_no}_{rgi_id}.zip?download=1"
-    elif (ord(rgi_no[0]) >= 83) and (ord(rgi_no[0]) < 84): # from S
-        gif_zip_fp = f"https://zenodo.org/records/17096370/files/{rgi_no}_{rgi_id}.zip?download=1"
-    elif (ord(rgi_no[0]) >= 84) and (ord(rgi_no[0]) < 91): # from T thru Z
-        gif_zip_fp = f"https://zenodo.org/records/17096411/files/{rgi_no}_{rgi_id}.zip?download=1"
-    
-    with st.spinner("Downloading animation..."):
-        zip_bytes = download_gif_zip(gif_zip_fp)
-    with st.spinner("Loading animation..."):
-        animations = get_animation_html(zip_bytes, rgi_no)
-    
     if animations:
         for pathrow, html_content in animations:
             st.write(f"pathrow: {pathrow}")
             st.components.v1.html(html_content, height=90*10, width=None, scrolling=True)
             
-        # download button
-        with st.spinner("Accessing data downloading options..."):
-            st.download_button(
-                label="Download animation",
-                data=export_gif(gif_zip_fp),  # fetch bytes directly here
-                file_name=f"{rgi_no}_animation.zip",
-                mime="application/zip"
-            )
+        # download button: read from the disk cache when clicked, not on every render
+        gif_zip_fp = animation_url(rgi_no, rgi_id)
+        st.download_button(
+            label="Download animation",
+            data=lambda: fetch_animation_zip(gif_zip_fp),
+            file_name=f"{rgi_no}_animation.zip",
+            mime="application/zip",
+            on_click="ignore"
+        )
     else:
-        st.error(f"No animation available for {rgi_no} Glacier.")
+        st.error(f"No animation available for {title}.")
 
 st.markdown(
     """
@@ -156,3 +128,5 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
+
+finish_page(timing_run)
@@ -0,0 +1,80 @@
+import streamlit as st
+import datetime
+from snowlines.fractions import VALUES, FractionStore
+from snowlines import timing
+from snowlines.debug_panel import finish_page
+
+st.set_page_config(
+    page_title="Regional snowline fractions",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+
+def nav():
+    with st.sidebar:
+        st.title("Navigation")
+        st.page_link("https://alaskasnowlines.streamlit.app/", label="Home - glacier selection")
+        st.page_link("https://alaskasnowlines.streamlit.app/plot_elev", label="Heatmap - elevation bins")
+        st.page_link("https://alaskasnowlines.streamlit.app/plot_area", label="Heatmap - area bins")
+        st.page_link("https://alaskasnowlines.streamlit.app/plot_gif", label="Glacier animations")
+        st.page_link("https://alaskasnowlines.streamlit.app/compare", label="Compare glaciers")
+        st.page_link("https://alaskasnowlines.streamlit.app/melt_metrics", label="Regional melt metrics")
+        st.page_link("https://alaskasnowlines.streamlit.app/snowline_fractions", label="Regional snowline fractions")
+        st.page_link("https://alaskasnowlines.streamlit.app/bulk_export", label="Bulk download")
+nav()
+
+st.session_state["current_page"] = "snowline_fractions"
+timing_run = timing.start_run("snowline_fractions")
+
+# ---------------- Load snowline fractions ----------------
+# reshaped once per process and shared by all sessions
+@st.cache_resource(show_spinner="Loading regional snowline fractions...")
+def get_fraction_store():
+    return FractionStore.from_bundle()
+
+# only the LTTB-downsampled points of the selected series reach the browser
+@st.cache_data(max_entries=64, show_spinner=False)
+def downsampled(value, series, start, end):
+    return get_fraction_store().downsampled(value, list(series), start, end)
+
+store = get_fraction_store()
+
+st.write("## Regional snowline fractions")
+st.write("Daily regional snowline fractions from Sentinel-1 SAR, by subregion and SAR direction.")
+
+# ---------------- Filters ----------------
+col1, col2, col3 = st.columns([4, 2, 2])
+with col1:
+    subregions = st.multiselect("Subregions:", store.subregions, default=store.subregions)
+with col2:
+    direction = st.radio("SAR direction:", ["Both", *store.directions], horizontal=True)
+with col3:
+    value = st.radio("Value:", list(VALUES), format_func=VALUES.get, horizontal=True)
+first, last = store.dates[0].date(), store.dates[-1].date()
+start, end = st.slider("Dates:", min_value=first, max_value=last, value=(first, last),
+                       step=datetime.timedelta(days=1), format="YYYY-MM-DD")
+
+series = tuple((s, d) for s, d in store.series if s in subregions and direction in ("Both", d))
+
+# ---------------- Plot ----------------
+if not series:
+    st.error("Select at least one subregion.")
+else:
+    st.line_chart(downsampled(value, series, start, end), x="date", y=VALUES[value], color="series", height=500)
+    st.caption("Each line is downsampled to about one point per pixel column, keeping its peaks and troughs.")
+
+st.markdown(
+    """
+    ---
+    <div style='text-align: center; font-size: 16px; color: gray;'>
+    Data courtesy of Albin Wells, David Rounce, and Mark Fahnestock<br>
+    Citation: Wells, A., Rounce, D., and Fahnestock, M. Seasonal progression of melt and snowlines 
+    in Alaska from SAR reveals impacts of warming. <i>npj Climate and Atmospheric Science</i> <b>9</b>, 
+    95 (2026). https://doi.org/10.1038/s41612-026-01321-y<br>
+    Correspondence: albin.wells@geo.uzh.ch
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+finish_page(timing_run)
@@ -0,0 +1 @@
+"""Shared helpers for the Alaska Snowlines pages."""
@@ -0,0 +1,21 @@
+"""The glacier catalog, search index and locator every page uses, built once per process."""
+import streamlit as st
+
+
+# imported on first use, so pages that never need the catalog don't load pandas
+@st.cache_resource(show_spinner="Loading glacier outlines...")
+def get_catalog():
+    from snowlines.catalog import load_catalog
+    return load_catalog()
+
+
+@st.cache_resource
+def get_search_index():
+    from snowlines.search import load_index
+    return load_index(get_catalog())
+
+
+@st.cache_resource
+def get_locator():
+    from snowlines.spatial import load_locator
+    return load_locator(get_catalog())
@@ -0,0 +1,150 @@
+"""Headless render of every glacier's heatmaps to PNGs for an offline atlas, resumable
+from {out}/manifest.jsonl (python -m snowlines.atlas --help)."""
+import argparse
+import json
+import os
+import sys
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from snowlines.parse import VARIANTS
+from snowlines.store import outer_archives
+from snowlines.zenodo import load_rgi_index
+
+MANIFEST = "manifest.jsonl"
+
+
+def _write_png(fp: str, png: bytes):
+    tmp = fp + ".part"
+    with open(tmp, "wb") as f:
+        f.write(png)
+    os.replace(tmp, fp)
+
+
+def render_glacier(rgi_no: str, zip_bytes: bytes, out: str, variants=VARIANTS,
+                   date_start="2017-01-01", date_end="2025-01-01", eos_corr: bool = False) -> dict:
+    """Render every pathrow of one inner glacier zip; returns the manifest record."""
+    # runs in a pool worker: matplotlib is imported there, not in the coordinating process
+    from snowlines.dataset import GlacierDataset
+    from snowlines.parse import parse_all
+    from snowlines.plotting import render_pathrow
+
+    images, errors = [], []
+    try:
+        dataset = GlacierDataset(rgi_no, parse_all(zip_bytes, max_workers=1))
+    except (zipfile.BadZipFile, ValueError, KeyError) as e:  # unreadable CSVs: logged, not retried
+        return {"glacier": rgi_no, "images": images, "errors": [f"{type(e).__name__}: {e}"]}
+    for variant in variants:
+        for data in dataset.pathrows(variant, eos_corr=eos_corr):
+            try:
+                png = render_pathrow(data, rgi_no, variant=variant, date_start=date_start, date_end=date_end)
+            except Exception as e:  # irregular bins, empty series, ...: logged, the run goes on
+                errors.append(f"{variant} {data['pathrow']}: {type(e).__name__}: {e}")
+                continue
+            if isinstance(png, str):
+                errors.append(png)
+                continue
+            name = os.path.join(variant, f"{rgi_no}_{data['pathrow']}.png")
+            _write_png(os.path.join(out, name), png)
+            images.append(name)
+    return {"glacier": rgi_no, "images": images, "errors": errors}
+
+
+class Manifest:
+    """Append-only progress log of a run; one JSON object per line."""
+
+    def __init__(self, out: str, settings: dict):
+        self.path = os.path.join(out, MANIFEST)
+        self.glaciers = set()
+        self.archives = set()
+        if os.path.exists(self.path):
+            with open(self.path, "rb+") as f:
+                complete = f.read().rpartition(b"\n")[0]
+                f.truncate(len(complete) + 1 if complete else 0)  # a torn last line is redone
+            records = [json.loads(line) for line in complete.decode().splitlines() if line]
+            if records and records[0].get("settings") != settings:
+                raise ValueError(f"{self.path} was written with {records[0].get('settings')}; "
+                                 f"use another --out or delete it to render with {settings}")
+            for record in records:
+                if "glacier" in record:
+                    self.glaciers.add(record["glacier"])
+                elif "archive" in record:
+                    self.archives.add(record["archive"])
+        self.f = open(self.path, "a")
+        if self.f.tell() == 0:
+            self.add({"settings": settings})
+
+    def add(self, record: dict):
+        self.f.write(json.dumps(record) + "\n")
+        self.f.flush()
+        os.fsync(self.f.fileno())
+
+    def close(self):
+        self.f.close()
+
+
+def render_atlas(out: str, archives_dir=None, workers: int = None, variants=VARIANTS,
+                 date_start="2017-01-01", date_end="2025-01-01", eos_corr: bool = False, zip_names=None) -> dict:
+    """Render every glacier of the outer archives (or of `zip_names`) into `out`; returns run counts."""
+    for variant in variants:
+        os.makedirs(os.path.join(out, variant), exist_ok=True)
+    settings = {"variants": list(variants), "date_start": date_start, "date_end": date_end, "eos_corr": eos_corr}
+    manifest = Manifest(out, settings)
+    index = load_rgi_index()
+    if zip_names is None:
+        zip_names = sorted(set(index.values()))
+    todo = [name for name in zip_names if name not in manifest.archives]
+    counts = {"archives": len(zip_names) - len(todo), "rendered": 0, "skipped": 0, "failed": 0}
+    workers = workers or os.cpu_count() or 1
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for zip_name, fp in outer_archives(archives_dir, todo):
+                with zipfile.ZipFile(fp) as zf:
+                    members = [m for m in zf.namelist() if m.endswith(".zip")]
+                    pending = set()
+                    for member in members:
+                        rgi_no = member[:-4]
+                        if rgi_no in manifest.glaciers:
+                            counts["skipped"] += 1
+                            continue
+                        if len(pending) >= 2 * workers:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            _record(done, manifest, counts)
+                        pending.add(pool.submit(render_glacier, rgi_no, zf.read(member), out, variants,
+                                                date_start, date_end, eos_corr))
+                    _record(wait(pending).done, manifest, counts)
+                manifest.add({"archive": zip_name, "glaciers": len(members)})
+                counts["archives"] += 1
+                print(f"{zip_name}: {len(members)} glaciers", file=sys.stderr)
+    finally:
+        manifest.close()
+    return counts
+
+
+def _record(futures, manifest: Manifest, counts: dict):
+    for future in futures:
+        record = future.result()
+        manifest.add(record)
+        manifest.glaciers.add(record["glacier"])
+        counts["failed" if record["errors"] and not record["images"] else "rendered"] += 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the heatmaps of every glacier to PNG files.")
+    parser.add_argument("--out", required=True, help="output directory; rerunning resumes from its manifest")
+    parser.add_argument("--archives", default=None,
+                        help="directory with local copies of the outer archives (default: download from Zenodo)")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: one per CPU)")
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=VARIANTS)
+    parser.add_argument("--start", default="2017-01-01", help="first date plotted")
+    parser.add_argument("--end", default="2025-01-01", help="last date plotted")
+    parser.add_argument("--eos-corr", action="store_true", help="plot the end-of-summer corrected percentiles")
+    parser.add_argument("zip_names", nargs="*", help="only these outer archives, e.g. data_rgi_01_00208_00993.zip")
+    args = parser.parse_args()
+    try:
+        counts = render_atlas(args.out, args.archives, args.workers, args.variants, args.start, args.end,
+                              args.eos_corr, args.zip_names or None)
+    except ValueError as e:
+        sys.exit(str(e))
+    print(f"{counts['rendered']} glaciers rendered, {counts['skipped']} already done, "
+          f"{counts['failed']} without a plottable pathrow, {counts['archives']} archives complete", file=sys.stderr)
@@ -0,0 +1,179 @@
+"""Byte-budgeted LRU disk cache for files fetched from Zenodo, shared by all sessions
+(SNOWLINES_CACHE_DIR, SNOWLINES_CACHE_BYTES)."""
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+
+CACHE_DIR = os.environ.get("SNOWLINES_CACHE_DIR", os.path.join(tempfile.gettempdir(), "alaska_snowlines"))
+CACHE_BYTES = int(os.environ.get("SNOWLINES_CACHE_BYTES", 2 * 1024**3))
+_SHARD = re.compile(r"[0-9a-f]{2}")
+
+
+class DiskCache:
+    """Byte-budgeted LRU cache of blobs on local disk."""
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = CACHE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_written = 0
+        self._total = None  # bytes on disk, computed lazily from a directory scan
+        self._added = 0  # net bytes put so far, to carry puts made during a scan into _total
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()  # one eviction pass at a time, outside _lock
+        self._inflight = {}  # key -> Future of the fetch running for it
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.root, digest[:2], digest)
+
+    def _touch(self, fp: str):
+        try:
+            os.utime(fp)  # mtime doubles as the LRU timestamp
+        except OSError:
+            pass
+
+    def get(self, key: str):
+        """Cached bytes for `key`, or None on a miss."""
+        fp = self.path(key)
+        try:
+            with open(fp, "rb") as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        self._touch(fp)
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store `data` under `key`, then evict old entries if over budget."""
+        fp = self.path(key)
+        os.makedirs(os.path.dirname(fp), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(fp), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            try:
+                replaced = os.path.getsize(fp)  # an overwrite only adds the difference
+            except OSError:
+                replaced = 0
+            os.replace(tmp, fp)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            self.bytes_written += len(data)
+            self._added += len(data) - replaced
+            if self._total is not None:
+                self._total += len(data) - replaced
+            over_budget = self._total is None or self._total > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def __contains__(self, key: str):
+        return os.path.exists(self.path(key))
+
+    def get_or_fetch(self, key: str, fetch):
+        """Return cached bytes for `key`, calling `fetch()` and storing the result on a miss.
+
+        A caller that misses while another thread fetches the same key waits for
+        that fetch instead of starting its own.
+        """
+        data = self.get(key)
+        if data is not None:
+            return data
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = Future()
+        if not leader:
+            return flight.result()
+        try:
+            data = fetch()
+            if data is not None:
+                self.put(key, data)
+            flight.set_result(data)
+            return data
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def _entries(self):
+        entries = []
+        for sub in os.scandir(self.root):
+            if not sub.is_dir() or not _SHARD.fullmatch(sub.name):  # only the digest[:2] shards are entries
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:  # removed by another process meanwhile
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        """Remove least-recently-used entries until the cache fits its byte budget.
+
+        The directory scan and removals run without holding the lock, so
+        gets and puts of other sessions carry on meanwhile.
+        """
+        if not self._evict_lock.acquire(blocking=False):
+            return  # another thread is already evicting
+        try:
+            with self._lock:
+                added_before = self._added
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            for _, size, fp in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(fp)
+                except OSError:
+                    continue
+                total -= size
+                evicted += 1
+            with self._lock:
+                self.evictions += evicted
+                # puts during the scan may be counted twice; the next scan corrects that
+                self._total = total + self._added - added_before
+        finally:
+            self._evict_lock.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "bytes_written": self.bytes_written,
+                "max_bytes": self.max_bytes,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_cache() -> DiskCache:
+    """Process-wide cache instance shared by all pages."""
+    return DiskCache()
@@ -0,0 +1,105 @@
+"""The glacier catalog with compact dtypes, loaded once per process from an .npz snapshot
+of the CSV (python -m snowlines.catalog builds it at deploy time)."""
+import argparse
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from snowlines.cache import CACHE_DIR
+from snowlines.timing import span
+
+CATALOG_CSV = os.path.join("data", "RGI2000-v7.0-G-01_alaska_2km2.csv")
+CATALOG_SNAPSHOT = os.environ.get("SNOWLINES_CATALOG", os.path.join("data", "catalog.npz"))
+FALLBACK_SNAPSHOT = os.path.join(CACHE_DIR, "catalog.npz")  # when CATALOG_SNAPSHOT can't be written
+FLOAT_COLUMNS = ["area_km2", "cenlat", "cenlon", "termlat", "termlon", "zmin_m", "zmax_m", "zmed_m"]
+CATEGORY_COLUMNS = ["o2region", "primeclass", "term_type", "surge_type"]
+TEXT_COLUMNS = ["rgi_id", "glac_name"]
+
+
+def _sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def read_catalog_csv(csv_path: str = CATALOG_CSV) -> pd.DataFrame:
+    """Parse, filter, prune and type the catalog CSV."""
+    df = pd.read_csv(csv_path, usecols=TEXT_COLUMNS + FLOAT_COLUMNS + CATEGORY_COLUMNS)
+    df = df[df["area_km2"] > 2]
+    df = df[~df["glac_name"].str.contains("_abl", case=False, na=False)]
+    df = df.assign(glac_name=df["glac_name"].fillna(""))
+    df = df.astype({**{c: "float32" for c in FLOAT_COLUMNS}, **{c: "category" for c in CATEGORY_COLUMNS}})
+    return df[TEXT_COLUMNS + FLOAT_COLUMNS + CATEGORY_COLUMNS].set_index("rgi_id", drop=False)
+
+
+def save_snapshot(df: pd.DataFrame, path: str, source_sha256: str):
+    """Write the typed catalog as plain arrays (no pickles), atomically."""
+    arrays = {"source_sha256": np.array(source_sha256)}
+    for col in TEXT_COLUMNS:
+        arrays[col] = df[col].to_numpy(dtype=str)
+    for col in FLOAT_COLUMNS:
+        arrays[col] = df[col].to_numpy()
+    for col in CATEGORY_COLUMNS:
+        arrays[f"{col}.codes"] = df[col].cat.codes.to_numpy()
+        arrays[f"{col}.categories"] = np.asarray(df[col].cat.categories.tolist())  # str or int, never object
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".npz")
+    with os.fdopen(fd, "wb") as f:
+        np.savez(f, **arrays)
+    os.chmod(tmp, 0o644)  # mkstemp creates 0600
+    os.replace(tmp, path)
+
+
+def load_snapshot(path: str):
+    """(catalog, SHA-256 of its source CSV) from an .npz snapshot."""
+    with np.load(path, allow_pickle=False) as z:
+        columns = {col: z[col].astype(object) for col in TEXT_COLUMNS}
+        columns.update({col: z[col] for col in FLOAT_COLUMNS})
+        for col in CATEGORY_COLUMNS:
+            categories = z[f"{col}.categories"]
+            if categories.dtype.kind == "U":
+                categories = pd.Index(categories, dtype="str")
+            columns[col] = pd.Categorical.from_codes(z[f"{col}.codes"], categories)
+        df = pd.DataFrame(columns).astype({col: "str" for col in TEXT_COLUMNS})
+        return df.set_index("rgi_id", drop=False), str(z["source_sha256"])
+
+
+def load_catalog(csv_path: str = CATALOG_CSV, snapshot_path: str = CATALOG_SNAPSHOT,
+                 fallback_path: str = FALLBACK_SNAPSHOT) -> pd.DataFrame:
+    """The catalog from a snapshot that matches the CSV, else parsed and snapshotted."""
+    with span("catalog"):
+        source = _sha256(csv_path)
+        df = loaded_from = None
+        for path in (snapshot_path, fallback_path):
+            if not os.path.exists(path):
+                continue
+            try:
+                df, snapshot_source = load_snapshot(path)
+            except (OSError, ValueError, KeyError):
+                continue  # unreadable or from an older layout: rebuild it
+            if snapshot_source == source:
+                loaded_from = path
+                break
+            df = None
+        if df is None:
+            df = read_catalog_csv(csv_path)
+        for path in (snapshot_path, fallback_path):
+            if path == loaded_from:
+                break
+            try:
+                save_snapshot(df, path, source)
+                break
+            except OSError:
+                continue  # read-only: try the next location, else keep serving from the CSV
+        return df
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prebuild the glacier catalog snapshot.")
+    parser.add_argument("--csv", default=CATALOG_CSV)
+    parser.add_argument("--out", default=CATALOG_SNAPSHOT)
+    args = parser.parse_args()
+    df = read_catalog_csv(args.csv)
+    save_snapshot(df, args.out, _sha256(args.csv))
+    print(f"{len(df)} glaciers, {df.memory_usage(deep=True).sum() / 1e6:.2f} MB in memory -> {args.out}")
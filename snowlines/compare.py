@@ -0,0 +1,106 @@
+"""Several glaciers loaded together, archive by archive, and their percentile series on one time axis."""
+import zipfile
+
+import numpy as np
+import pandas as pd
+import requests
+
+from snowlines import timing, zenodo
+from snowlines.cache import get_cache
+from snowlines.dataset import get_dataset, has_local
+from snowlines.export import archive_members, group_by_archive
+from snowlines.fractions import CHART_WIDTH, lttb
+
+SERIES = {"sl": "Snowline", "me": "Melt extent"}
+
+
+def _load_archive(pool, zip_name: str, rgi_nos):
+    """{rgi_no: Future of its dataset, or None if the archive lacks it}; uncached members are read in one pass."""
+    cache = get_cache()
+    jobs, pending = {}, []
+    for rgi_no in rgi_nos:
+        if has_local(rgi_no) or zenodo.glacier_zip_key(rgi_no) in cache:
+            jobs[rgi_no] = timing.submit(pool, get_dataset, rgi_no)
+        else:
+            pending.append(rgi_no)
+    if pending:
+        for rgi_no, data in archive_members(zenodo.DATA_URL.format(zip_name=zip_name), pending):
+            if data is None:
+                jobs[rgi_no] = None
+                continue
+            cache.put(zenodo.glacier_zip_key(rgi_no), data)
+            jobs[rgi_no] = timing.submit(pool, get_dataset, rgi_no)  # parse while the next member downloads
+    return jobs
+
+
+def load_datasets(rgi_nos, pool):
+    """({rgi_no: GlacierDataset or None}, {archive or rgi_no: error}) for `rgi_nos`, fetched concurrently by archive.
+
+    Glaciers that could not be read, alone or with their whole archive, are
+    left out of the datasets. Archive readers only submit parses to `pool`,
+    never wait on them, so one pool serves both.
+    """
+    groups, _ = group_by_archive(rgi_nos)
+    datasets, failed = dict.fromkeys(rgi_nos), {}
+    archives = {zip_name: timing.submit(pool, _load_archive, pool, zip_name, members)
+                for zip_name, members in groups.items()}
+    for zip_name, archive in archives.items():
+        try:
+            jobs = archive.result()
+        except (requests.RequestException, OSError, zipfile.BadZipFile) as e:
+            failed[zip_name] = str(e)
+            for rgi_no in groups[zip_name]:
+                del datasets[rgi_no]
+            continue
+        for rgi_no, job in jobs.items():
+            try:
+                datasets[rgi_no] = None if job is None else job.result()
+            except Exception as e:  # one unreadable glacier must not take the others down
+                failed[rgi_no] = f"{type(e).__name__}: {e}"
+                del datasets[rgi_no]
+    return datasets, failed
+
+def _elevation_range(pathrows):
+    bins = pathrows[0]["bins_center"]
+    half = (bins[1] - bins[0]) / 2 if len(bins) > 1 else 0
+    return bins[0] - half, bins[-1] + half
+
+
+def series_matrix(datasets: dict, field: str, eos_corr: bool = False, relative: bool = False):
+    """(daily dates, glaciers x days float32 matrix) of one percentile series (SERIES key), averaged over pathrows.
+
+    Rows follow `datasets` (glaciers without data are all NaN). With `relative`,
+    elevations are scaled to 0 at the bottom and 1 at the top of each glacier.
+    """
+    per_glacier = [[] if d is None else d.pathrows("elev", eos_corr=eos_corr) for d in datasets.values()]
+    all_dates = [data[f"{field}_dates"] for pathrows in per_glacier for data in pathrows if len(data[field])]
+    if not all_dates:
+        return pd.DatetimeIndex([]), np.full((len(per_glacier), 0), np.nan, dtype=np.float32)
+    dates = pd.date_range(min(d.min() for d in all_dates), max(d.max() for d in all_dates), freq="D")
+    sums = np.zeros((len(per_glacier), len(dates)))
+    counts = np.zeros((len(per_glacier), len(dates)))
+    for row, pathrows in enumerate(per_glacier):
+        for data in pathrows:
+            values = data[field].astype(float)
+            if relative:
+                bottom, top = _elevation_range(pathrows)
+                values = (values - bottom) / (top - bottom)
+            valid = ~np.isnan(values)
+            day = ((data[f"{field}_dates"][valid] - dates[0].to_datetime64()) // np.timedelta64(1, "D")).astype(int)
+            np.add.at(sums[row], day, values[valid])
+            np.add.at(counts[row], day, 1)
+    with np.errstate(invalid="ignore"):
+        return dates, (sums / counts).astype(np.float32)
+
+
+def downsampled(dates, matrix, labels, value_name: str, start=None, end=None, n_out: int = CHART_WIDTH) -> pd.DataFrame:
+    """Long-form (date, glacier, value) LTTB selection of each row of `matrix` within [start, end]."""
+    lo = 0 if start is None else dates.searchsorted(pd.Timestamp(start))
+    hi = len(dates) if end is None else dates.searchsorted(pd.Timestamp(end), side="right")
+    y = matrix[:, lo:hi]
+    keep = lttb(np.arange(hi - lo, dtype=float), y.astype(float), n_out)
+    return pd.DataFrame({
+        "date": dates[lo:hi][keep.ravel()],
+        "glacier": pd.Categorical.from_codes(np.repeat(np.arange(len(labels)), keep.shape[1]), labels),
+        value_name: np.take_along_axis(y, keep, axis=1).ravel(),
+    })
@@ -0,0 +1,122 @@
+"""One glacier's data in every variant, from the store or one zip fetch, kept in a process-wide LRU."""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+
+import numpy as np
+
+from snowlines.parse import parse_all
+from snowlines.store import open_store
+from snowlines.timing import span
+from snowlines.zenodo import fetch_glacier_zip
+
+MAX_DATASETS = 32
+
+
+class GlacierDataset:
+    """All pathrows of one glacier, per bin variant, with raw and corrected percentiles."""
+
+    def __init__(self, rgi_no: str, variants: dict):
+        self.rgi_no = rgi_no
+        self.variants = variants  # {variant: [dict of arrays per pathrow]}
+        for pathrows in variants.values():
+            for data in pathrows:
+                for value in data.values():
+                    if isinstance(value, np.ndarray):
+                        value.setflags(write=False)
+
+    @classmethod
+    def from_zip(cls, rgi_no: str, zip_bytes: bytes):
+        return cls(rgi_no, parse_all(zip_bytes))
+
+    @classmethod
+    def from_store(cls, rgi_no: str, store):
+        return cls(rgi_no, store.load_all(rgi_no))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(value.nbytes for pathrows in self.variants.values() for data in pathrows
+                   for value in data.values() if isinstance(value, np.ndarray))
+
+    def has_eos_corr(self, variant: str = "elev") -> bool:
+        """Whether any pathrow has end-of-summer corrected percentiles."""
+        return any(len(data["sl_eos"]) or len(data["me_eos"]) for data in self.variants.get(variant, []))
+
+    def pathrows(self, variant: str = "elev", eos_corr: bool = False):
+        """Per-pathrow dicts in the layout render_pathrow and heatmap_payload take (views, no copies)."""
+        sl, me = ("sl_eos", "me_eos") if eos_corr else ("sl", "me")
+        return [{"pathrow": data["pathrow"], "dates": data["dates"], "db_bin": data["db_bin"],
+                 "bins_center": data["bins_center"], "binned_area": data["binned_area"],
+                 "sl_dates": data[sl + "_dates"], "sl": data[sl], "me_dates": data[me + "_dates"], "me": data[me]}
+                for data in self.variants.get(variant, [])]
+
+
+@lru_cache(maxsize=1)
+def _store():
+    return open_store()
+
+
+def load_dataset(rgi_no: str):
+    """The glacier's dataset from the store, or fetched and parsed; None if it has no data."""
+    store = _store()
+    if store is not None and rgi_no in store:
+        return GlacierDataset.from_store(rgi_no, store)
+    zip_bytes = fetch_glacier_zip(rgi_no)
+    return None if zip_bytes is None else GlacierDataset.from_zip(rgi_no, zip_bytes)
+
+
+_lock = threading.Lock()
+_datasets = OrderedDict()  # rgi_no -> GlacierDataset or None, least recently used first
+_loading = {}  # rgi_no -> Future of the load in progress
+_counts = {"hits": 0, "misses": 0}
+
+
+def has_local(rgi_no: str) -> bool:
+    """Whether get_dataset can serve `rgi_no` without a download: already loaded, or in the store."""
+    store = _store()
+    return rgi_no in _datasets or (store is not None and rgi_no in store)
+
+
+def get_dataset(rgi_no: str):
+    """Shared, cached dataset of a glacier; concurrent first requests share one load."""
+    with _lock:
+        if rgi_no in _datasets:
+            _datasets.move_to_end(rgi_no)
+            _counts["hits"] += 1
+            return _datasets[rgi_no]
+        _counts["misses"] += 1
+        flight = _loading.get(rgi_no)
+        leader = flight is None
+        if leader:
+            flight = _loading[rgi_no] = Future()
+    if not leader:
+        with span("dataset wait"):  # another session is loading it
+            return flight.result()
+    try:
+        dataset = load_dataset(rgi_no)
+    except BaseException as e:  # not cached: the next request retries
+        with _lock:
+            del _loading[rgi_no]
+        flight.set_exception(e)
+        raise
+    with _lock:
+        _datasets[rgi_no] = dataset
+        while len(_datasets) > MAX_DATASETS:
+            _datasets.popitem(last=False)
+        del _loading[rgi_no]
+    flight.set_result(dataset)
+    return dataset
+
+
+def stats() -> dict:
+    """Lookups and footprint of the shared datasets."""
+    with _lock:
+        lookups = _counts["hits"] + _counts["misses"]
+        return {
+            **_counts,
+            "hit_rate": _counts["hits"] / lookups if lookups else 0.0,
+            "datasets": len(_datasets),
+            "loading": len(_loading),
+            "bytes": sum(d.nbytes for d in _datasets.values() if d is not None),
+        }
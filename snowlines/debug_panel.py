@@ -0,0 +1,56 @@
+"""Closes a page's timing run; with ?debug=1 or SNOWLINES_DEBUG=1 it also shows timings and cache stats."""
+import os
+import sys
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from snowlines import http_client, timing
+from snowlines.cache import get_cache
+
+DEBUG = os.environ.get("SNOWLINES_DEBUG", "") == "1"
+
+
+def debug_enabled() -> bool:
+    return DEBUG or st.query_params.get("debug") == "1"
+
+
+def _stage_table(summary: dict) -> str:
+    rows = sorted(summary["stages"].items(), key=lambda item: -item[1]["ms"])
+    lines = ["| stage | calls | ms |", "|---|---:|---:|"]
+    lines += [f"| {stage} | {entry['calls']} | {entry['ms']:.1f} |" for stage, entry in rows]
+    return "\n".join(lines)
+
+
+def _caches(figure_cache=None) -> dict:
+    caches = {"disk cache": get_cache().stats(), "http": http_client.stats()}
+    if figure_cache is not None:
+        caches["figure cache"] = figure_cache.stats()
+    # only what this process has loaded: the panel should not import datasets or start a prefetch pool
+    dataset = sys.modules.get("snowlines.dataset")
+    if dataset is not None:
+        caches["glacier datasets"] = dataset.stats()
+    prefetch = sys.modules.get("snowlines.prefetch")
+    if prefetch is not None and prefetch.get_prefetcher() is not None:
+        caches["prefetch"] = prefetch.get_prefetcher().stats()
+    return caches
+
+
+def finish_page(run, figure_cache=None) -> dict:
+    """Close and log the page's timing run; show the debug panel if it is enabled."""
+    ctx = get_script_run_ctx()
+    record = timing.finish_run(run, session=ctx.session_id if ctx is not None else None)
+    if not debug_enabled():
+        return record
+    with st.expander("Debug: timings and caches", expanded=True):
+        st.markdown(f"**This run:** {record['total_ms']:.0f} ms, {record['http_requests']} HTTP requests, "
+                    f"{record['bytes_fetched'] / 1e6:.2f} MB fetched")
+        if record["stages"]:
+            st.markdown(_stage_table(record))
+        totals = timing.process_totals.summary()
+        st.markdown(f"**This process:** {totals['http_requests']} HTTP requests, "
+                    f"{totals['bytes_fetched'] / 1e6:.2f} MB fetched")
+        if totals["stages"]:
+            st.markdown(_stage_table(totals))
+        st.json(_caches(figure_cache))
+    return record
@@ -0,0 +1,118 @@
+"""Bulk export of many glaciers' inner zips into one zip, one range-read pass per Zenodo archive
+(python -m snowlines.export --help)."""
+import argparse
+import io
+import re
+import sys
+import zipfile
+
+import requests
+
+from snowlines import zenodo
+from snowlines.cache import get_cache
+from snowlines.remote_zip import RemoteZip
+
+_RGI_NO = re.compile(r"(?<![\w.])(?:RGI2000-v7\.0-G-)?(?:01[.-])?(\d{5})(?!\d)", re.IGNORECASE)
+
+
+def parse_rgi_numbers(text: str):
+    """RGI numbers ('01.00570') in free text: full RGI IDs, '01.00570', '01-00570' or '00570'; duplicates dropped."""
+    return list(dict.fromkeys(f"01.{digits}" for digits in _RGI_NO.findall(text)))
+
+
+def group_by_archive(rgi_nos):
+    """({outer archive name: [rgi_no, ...]}, [rgi_no without data]), in archive order."""
+    index = zenodo.load_rgi_index()
+    groups, missing = {}, []
+    for rgi_no in dict.fromkeys(rgi_nos):
+        zip_name = index.get(f"{rgi_no}.zip")
+        if zip_name is None:
+            missing.append(rgi_no)
+        else:
+            groups.setdefault(zip_name, []).append(rgi_no)
+    return {name: sorted(groups[name]) for name in sorted(groups)}, missing
+
+
+def archive_members(zip_url: str, rgi_nos):
+    """Yield (rgi_no, inner zip bytes or None) for one outer archive, cached members first."""
+    cache = get_cache()
+    pending = []
+    for rgi_no in rgi_nos:
+        data = cache.get(f"{zip_url}#{rgi_no}.zip")
+        if data is None:
+            pending.append(rgi_no)
+        else:
+            yield rgi_no, data
+    if not pending:
+        return
+    outer = cache.get(zip_url)  # a full copy is only cached when the server ignored ranges
+    with (zipfile.ZipFile(io.BytesIO(outer)) if outer is not None else RemoteZip(zip_url)) as zf:
+        names = set(zf.namelist())
+        for rgi_no in pending:
+            if f"{rgi_no}.zip" not in names:
+                yield rgi_no, None
+        wanted = [f"{rgi_no}.zip" for rgi_no in pending if f"{rgi_no}.zip" in names]
+        if outer is not None:
+            for name in wanted:
+                yield name[:-4], zf.read(name)
+        else:
+            for name, data in zf.iter_members(wanted):
+                yield name[:-4], data
+
+
+def export_glaciers(rgi_nos, out, progress=None) -> dict:
+    """Write the inner {rgi_no}.zip of every glacier in `rgi_nos` into a new zip on the file object `out`.
+
+    `progress(done, total, rgi_no)` is called after each glacier. Returns a
+    summary: glaciers written, RGI numbers without data, and archives that
+    could not be read (name -> error), whose glaciers are skipped.
+    """
+    groups, missing = group_by_archive(rgi_nos)
+    total = sum(len(members) for members in groups.values())
+    written, failed, done = [], {}, 0
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as zf:
+        for zip_name, members in groups.items():
+            zip_url = zenodo.DATA_URL.format(zip_name=zip_name)
+            remaining = set(members)
+            try:
+                for rgi_no, data in archive_members(zip_url, members):
+                    remaining.discard(rgi_no)
+                    if data is None:
+                        missing.append(rgi_no)
+                    else:
+                        zf.writestr(f"{rgi_no}.zip", data)
+                        written.append(rgi_no)
+                    done += 1
+                    if progress is not None:
+                        progress(done, total, rgi_no)
+            except (requests.RequestException, OSError, zipfile.BadZipFile) as e:
+                failed[zip_name] = str(e)
+                done += len(remaining)
+                if progress is not None:
+                    progress(done, total, zip_name)
+    return {"written": written, "missing": missing, "failed": failed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the data of many glaciers into one zip.")
+    parser.add_argument("rgi_nos", nargs="*", help="RGI numbers, e.g. 01.00570 or 00570")
+    parser.add_argument("--file", help="text file with RGI numbers (any separators)")
+    parser.add_argument("--out", required=True, help="output zip, or - for stdout")
+    args = parser.parse_args()
+    text = " ".join(args.rgi_nos)
+    if args.file:
+        with open(args.file) as f:
+            text += " " + f.read()
+
+    def report(done, total, rgi_no):
+        print(f"\r{done}/{total} {rgi_no}", end="", file=sys.stderr, flush=True)
+
+    if args.out == "-":
+        summary = export_glaciers(parse_rgi_numbers(text), sys.stdout.buffer, report)
+    else:
+        with open(args.out, "wb") as f:
+            summary = export_glaciers(parse_rgi_numbers(text), f, report)
+    print(f"\n{len(summary['written'])} glaciers written, {len(summary['missing'])} without data", file=sys.stderr)
+    for zip_name, error in summary["failed"].items():
+        print(f"{zip_name}: {error}", file=sys.stderr)
+    sys.exit(1 if summary["failed"] else 0)
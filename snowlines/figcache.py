@@ -0,0 +1,64 @@
+"""Size-bounded, process-wide LRU cache of rendered heatmap PNGs (SNOWLINES_FIGURE_CACHE_BYTES)."""
+import io
+import os
+import threading
+from collections import OrderedDict
+
+from snowlines.timing import span
+
+FIGURE_CACHE_BYTES = int(os.environ.get("SNOWLINES_FIGURE_CACHE_BYTES", 256 * 1024**2))
+SAVEFIG_KWARGS = {"format": "png", "bbox_inches": "tight", "dpi": 200}  # same as st.pyplot
+
+
+class FigureCache:
+    """Thread-safe LRU mapping of figure keys to PNG bytes."""
+
+    def __init__(self, max_bytes: int = FIGURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            png = self._items.get(key)
+            if png is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return png
+
+    def put(self, key, png: bytes):
+        if len(png) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.n_bytes -= len(old)
+            self._items[key] = png
+            self.n_bytes += len(png)
+            while self.n_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.n_bytes -= len(evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "figures": len(self._items),
+                "bytes": self.n_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def figure_png(fig) -> bytes:
+    """Render a matplotlib figure to PNG bytes the way st.pyplot would."""
+    buf = io.BytesIO()
+    with span("savefig"):
+        fig.savefig(buf, **SAVEFIG_KWARGS)
+    return buf.getvalue()
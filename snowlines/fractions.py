@@ -0,0 +1,120 @@
+"""Regional snowline fractions reshaped for multi-year plots, with batched LTTB downsampling."""
+import io
+import re
+
+import numpy as np
+import pandas as pd
+
+from snowlines.regional import SNOWLINE_FRACTIONS_CSV, read_member
+from snowlines.timing import span
+
+VALUES = {
+    "frac_sl": "Snowline fraction",
+    "frac_sl_area": "Snowline area fraction",
+}
+TOTAL = "Alaska"  # regional total, listed after the subregions
+CHART_WIDTH = 800  # points per series: roughly the pixel width of a wide-layout chart
+_COLUMN = re.compile(r"^(?P<subregion>.+)_(?P<direction>Ascending|Descending)_(?P<value>frac_sl(?:_area)?)$")
+
+
+def read_fractions(raw: bytes = None) -> pd.DataFrame:
+    """Long-form table indexed by date: subregion, direction and float32 VALUES; rows with no data dropped."""
+    if raw is None:
+        raw = read_member(SNOWLINE_FRACTIONS_CSV)
+    wide = pd.read_csv(io.BytesIO(raw), index_col="date", parse_dates=["date"])
+    keys = wide.columns.str.extract(_COLUMN)
+    wide.columns = pd.MultiIndex.from_frame(keys, names=["subregion", "direction", None])
+    long = wide.stack(["subregion", "direction"]).dropna(how="all", subset=list(VALUES))
+    subregions = sorted(set(keys["subregion"]) - {TOTAL}) + [TOTAL]
+    long = long.reset_index(["subregion", "direction"]).astype({
+        "subregion": pd.CategoricalDtype(subregions),
+        "direction": "category",
+        **{v: "float32" for v in VALUES},
+    })
+    return long.sort_values(["subregion", "direction"], kind="stable")[["subregion", "direction", *VALUES]]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices (series x n_out) of the points LTTB keeps from each row of `y` (series x len(x)).
+
+    `x` is shared by all rows. NaNs are skipped unless a whole bucket is NaN, in
+    which case the bucket yields a NaN point, so gaps in the record stay gaps.
+    """
+    n_series, n = y.shape
+    if n_out >= n or n_out < 3:
+        return np.broadcast_to(np.arange(n), (n_series, n))
+    edges = (1 + np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(int)  # n_out - 2 buckets in [1, n - 1)
+    valid = ~np.isnan(y)
+    # reduceat's last segment runs to the end of the array; drop it, it is only the final point
+    with np.errstate(invalid="ignore", divide="ignore"):
+        y_mean = (np.add.reduceat(np.where(valid, y, 0), edges, axis=1)[:, :-1]
+                  / np.add.reduceat(valid, edges, axis=1)[:, :-1])
+    x_mean = np.add.reduceat(x, edges)[:-1] / np.diff(edges)
+
+    rows = np.arange(n_series)
+    keep = np.empty((n_series, n_out), dtype=int)
+    keep[:, 0], keep[:, -1] = 0, n - 1
+    a = keep[:, 0]
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        ax, ay = x[a], y[rows, a]
+        ay = np.where(np.isnan(ay), y_mean[:, b], ay)  # after a gap, measure from the bucket's own mean
+        if b + 1 < n_out - 2:
+            cx, cy = x_mean[b + 1], y_mean[:, b + 1]
+        else:
+            cx, cy = x[-1], y[:, -1]
+        cy = np.where(np.isnan(cy), ay, cy)
+        xb, yb = x[lo:hi], y[:, lo:hi]
+        # twice the area of the triangle (previous pick, candidate, next bucket's mean)
+        area = np.abs((ax - cx)[:, None] * (yb - ay[:, None]) - (ax[:, None] - xb) * (cy - ay)[:, None])
+        a = lo + np.argmax(np.where(np.isnan(area), -1, area), axis=1)
+        keep[:, b + 1] = a
+    return keep
+
+
+class FractionStore:
+    """The long-form table plus a series x day float32 matrix of each value for downsampling."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.subregions = list(df["subregion"].cat.categories)
+        self.directions = list(df["direction"].cat.categories)
+        self.dates = pd.date_range(df.index.min(), df.index.max(), freq="D")
+        self.series = [(s, d) for s in self.subregions for d in self.directions]
+        day = ((df.index - self.dates[0]) // pd.Timedelta(days=1)).to_numpy()
+        row = df["subregion"].cat.codes.to_numpy() * len(self.directions) + df["direction"].cat.codes.to_numpy()
+        self.matrix = {}
+        for value in VALUES:
+            m = np.full((len(self.series), len(self.dates)), np.nan, dtype=np.float32)
+            m[row, day] = df[value].to_numpy()
+            self.matrix[value] = m
+
+    @classmethod
+    def from_bundle(cls):
+        with span("fractions"):
+            return cls(read_fractions())
+
+    def _window(self, series, start, end):
+        lo = 0 if start is None else self.dates.searchsorted(pd.Timestamp(start))
+        hi = len(self.dates) if end is None else self.dates.searchsorted(pd.Timestamp(end), side="right")
+        return lo, hi, [self.series.index(key) for key in series]
+
+    def downsampled(self, value: str, series, start=None, end=None, n_out: int = CHART_WIDTH) -> pd.DataFrame:
+        """Long-form (date, series, value) LTTB selection of `series` [(subregion, direction)] within [start, end]."""
+        lo, hi, rows = self._window(series, start, end)
+        y = self.matrix[value][rows, lo:hi]
+        x = np.arange(hi - lo, dtype=float)
+        keep = lttb(x, y.astype(float), n_out)
+        labels = [f"{s} ({d})" for s, d in series]
+        return pd.DataFrame({
+            "date": self.dates[lo:hi][keep.ravel()],
+            # categorical labels ship as an Arrow dictionary instead of one string per point
+            "series": pd.Categorical.from_codes(np.repeat(np.arange(len(series)), keep.shape[1]), labels),
+            VALUES[value]: np.take_along_axis(y, keep, axis=1).ravel(),
+        })
+
+    def raw(self, value: str, series, start=None, end=None) -> pd.DataFrame:
+        """Wide daily frame of `series` within [start, end], one column per series (no downsampling)."""
+        lo, hi, rows = self._window(series, start, end)
+        return pd.DataFrame(self.matrix[value][rows, lo:hi].T, index=self.dates[lo:hi],
+                            columns=[f"{s} ({d})" for s, d in series])
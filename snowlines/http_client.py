@@ -0,0 +1,121 @@
+"""Shared HTTP session for every remote fetch, with timeouts, retries with backoff and a
+per-host concurrency limit (SNOWLINES_HTTP_* settings)."""
+import os
+import random
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from snowlines import timing
+
+CONNECT_TIMEOUT = float(os.environ.get("SNOWLINES_HTTP_CONNECT_TIMEOUT", 10))
+READ_TIMEOUT = float(os.environ.get("SNOWLINES_HTTP_READ_TIMEOUT", 60))  # longest silence between bytes
+RETRIES = int(os.environ.get("SNOWLINES_HTTP_RETRIES", 4))
+PER_HOST = int(os.environ.get("SNOWLINES_HTTP_PER_HOST", 4))
+BACKOFF_BASE = 0.5  # seconds; attempt n sleeps up to BACKOFF_BASE * 2**n
+BACKOFF_MAX = 30.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+_lock = threading.Lock()
+_slots = {}  # host -> BoundedSemaphore
+_counts = {"requests": 0, "retries": 0, "failures": 0}
+
+
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """Process-wide session with a connection pool sized for PER_HOST concurrent requests per host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=PER_HOST, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _slot(url: str) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc
+    with _lock:
+        if host not in _slots:
+            _slots[host] = threading.BoundedSemaphore(PER_HOST)
+        return _slots[host]
+
+
+def _count(event: str):
+    with _lock:
+        _counts[event] += 1
+
+
+def _backoff(attempt: int, response=None) -> float:
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after is not None and retry_after.isdigit():
+        return min(float(retry_after), BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _release_on_close(response: requests.Response, slot: threading.BoundedSemaphore):
+    """Keep the host slot taken until the streamed `response` is closed, released once."""
+    close = response.close
+    held = [True]
+
+    def close_and_release():
+        try:
+            close()
+        finally:
+            with _lock:
+                release, held[0] = held[0], False
+            if release:
+                slot.release()
+    response.close = close_and_release
+
+
+def get(url: str, headers=None, stream: bool = False, timeout=None, retries: int = RETRIES) -> requests.Response:
+    """GET `url` through the shared session, retrying transient failures; raises for an error status.
+
+    A streamed response holds its connection and its host slot until it is
+    closed (use it as a context manager); its body is not counted in the
+    timing totals.
+    """
+    timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    slot = _slot(url)
+    for attempt in range(retries + 1):
+        response, error = None, None
+        slot.acquire()
+        try:
+            with timing.span("download"):
+                _count("requests")
+                try:
+                    response = get_session().get(url, headers=headers, stream=stream, timeout=timeout)
+                    if not stream:
+                        timing.fetched(len(response.content))
+                except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                    error = e
+        except BaseException:
+            slot.release()
+            raise
+        if stream and response is not None:
+            _release_on_close(response, slot)  # the body is read after we return
+        else:
+            slot.release()
+        if error is None and response.status_code not in RETRY_STATUS:
+            if not response.ok:
+                response.close()
+            response.raise_for_status()
+            return response
+        if attempt == retries:
+            _count("failures")
+            if error is not None:
+                raise error
+            response.close()
+            response.raise_for_status()
+        _count("retries")
+        delay = _backoff(attempt, response)
+        if response is not None:
+            response.close()
+        time.sleep(delay)
+
+def stats() -> dict:
+    with _lock:
+        return dict(_counts)
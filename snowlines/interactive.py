@@ -0,0 +1,261 @@
+"""Client-side heatmaps: one compact payload, zoomed and panned in the browser without reruns."""
+import base64
+import json
+import warnings
+
+import numpy as np
+
+from snowlines.plotting import pathrow_axes
+from snowlines.regrid import regrid_12d
+
+DEFAULT_VIEW = ("2017-01-01", "2025-01-01")
+
+
+def _days(dates):
+    return np.asarray(dates).astype("datetime64[D]").astype(np.int64)
+
+
+def _downsample_columns(values, max_columns):
+    """Block-average columns so at most `max_columns` remain."""
+    factor = int(np.ceil(values.shape[1] / max_columns))
+    if factor <= 1:
+        return values
+    pad = (-values.shape[1]) % factor
+    values = np.pad(values, ((0, 0), (0, pad)), constant_values=np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN blocks stay NaN
+        return np.nanmean(values.reshape(values.shape[0], -1, factor), axis=2)
+
+
+def _downsample_line(x, y, max_points):
+    """Bucket means of a (days, values) line, NaN where a bucket has no data."""
+    x, y = _days(x), np.asarray(y, dtype=float)
+    if len(x) > max_points:
+        starts = np.unique(np.arange(len(x)) * max_points // len(x), return_index=True)[1]
+        valid = ~np.isnan(y)
+        counts = np.add.reduceat(valid.astype(int), starts)
+        sums = np.add.reduceat(np.where(valid, y, 0.0), starts)
+        x = x[starts]
+        y = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    return x.tolist(), [None if np.isnan(v) else round(float(v), 3) for v in y]
+
+
+def heatmap_payload(data, rgi_no: str, variant: str = "elev", eos_data=None,
+                    max_columns: int = 1000, max_points: int = 2000):
+    """JSON-serializable payload for one pathrow, or None if it has no dates.
+
+    `eos_data` adds the end-of-summer corrected lines when it has any.
+    """
+    try:
+        grid, db_bin_12d, _ = regrid_12d(data["db_bin"], data["dates"])
+    except IndexError:  # no acquisitions: skipped, as plot_db_heatmap does
+        return None
+    vmin, vmax = np.nanpercentile(data["db_bin"], [2, 98])
+    cells = _downsample_columns(db_bin_12d, max_columns)
+    q = np.clip(np.round((cells - vmin) / (vmax - vmin) * 254), 0, 254)
+    q = np.where(np.isnan(cells), 255, q).astype(np.uint8)
+
+    set_ymin, set_ymax, ylabel, lines = pathrow_axes(data, variant)
+    def encode_lines(lines):
+        encoded = []
+        for x, y, ls, label in lines:
+            xs, ys = _downsample_line(x, y, max_points)
+            encoded.append({"label": label, "dashed": ls != "-", "x": xs, "y": ys})
+        return encoded
+
+    has_eos = eos_data is not None and (len(eos_data["sl"]) or len(eos_data["me"]))
+    grid_days = _days(grid)
+    view = np.clip(_days(np.array(DEFAULT_VIEW, dtype="datetime64[D]")), grid_days[0], grid_days[-1])
+    return {
+        "title": f"{rgi_no} (pathrow: {data['pathrow']})",
+        "ylabel": ylabel.replace("$km^2$", "km²"),
+        "ymin": float(set_ymin), "ymax": float(set_ymax),
+        "x0": int(grid_days[0]), "x1": int(grid_days[-1]),
+        "view": [int(view[0]), int(view[1])] if view[1] > view[0] else [int(grid_days[0]), int(grid_days[-1])],
+        "rows": int(q.shape[0]), "cols": int(q.shape[1]),
+        "vmin": float(vmin), "vmax": float(vmax),
+        "cells": base64.b64encode(q.tobytes()).decode(),
+        "lines": {
+            "raw": encode_lines(lines),
+            "eos": encode_lines(pathrow_axes(eos_data, variant)[3]) if has_eos else None,
+        },
+    }
+
+
+def heatmap_html(payload, height: int = 380) -> str:
+    """Self-contained HTML/JS that draws and interacts with one heatmap payload."""
+    return (_TEMPLATE.replace("__PAYLOAD__", json.dumps(payload, separators=(",", ":")))
+            .replace("__HEIGHT__", str(height)))
+
+
+_TEMPLATE = """
+<div id="wrap" style="font-family: sans-serif; font-size: 13px;">
+  <div style="margin-bottom: 4px;">
+    From <input type="date" id="d0"> to <input type="date" id="d1">
+    <label id="eos-label" style="margin-left: 12px;"><input type="checkbox" id="eos"> End-of-summer correction</label>
+    <button id="reset" style="margin-left: 12px;">Reset view</button>
+    <span style="color: gray; margin-left: 12px;">scroll to zoom, drag to pan</span>
+  </div>
+  <canvas id="hm" style="width: 100%; cursor: grab;"></canvas>
+</div>
+<script>
+(function () {
+  const P = __PAYLOAD__;
+  const H = __HEIGHT__, DAY = 864e5, M = {l: 70, r: 100, t: 24, b: 28};
+  // matplotlib RdYlBu (ColorBrewer, 11 classes)
+  const STOPS = [[165,0,38],[215,48,39],[244,109,67],[253,174,97],[254,224,144],[255,255,191],
+                 [224,243,248],[171,217,233],[116,173,209],[69,117,180],[49,54,149]];
+  const colors = [];
+  for (let i = 0; i < 255; i++) {
+    const t = i / 254 * (STOPS.length - 1), k = Math.min(Math.floor(t), STOPS.length - 2), f = t - k;
+    colors.push(STOPS[k].map((c, j) => Math.round(c + (STOPS[k + 1][j] - c) * f)));
+  }
+
+  // decode the quantized grid once into an offscreen image (row 0 at the bottom)
+  const cells = Uint8Array.from(atob(P.cells), c => c.charCodeAt(0));
+  const img = document.createElement("canvas");
+  img.width = P.cols; img.height = P.rows;
+  const ictx = img.getContext("2d"), px = ictx.createImageData(P.cols, P.rows);
+  for (let r = 0; r < P.rows; r++) {
+    for (let c = 0; c < P.cols; c++) {
+      const q = cells[r * P.cols + c], o = ((P.rows - 1 - r) * P.cols + c) * 4;
+      if (q === 255) continue;
+      px.data[o] = colors[q][0]; px.data[o + 1] = colors[q][1]; px.data[o + 2] = colors[q][2]; px.data[o + 3] = 255;
+    }
+  }
+  ictx.putImageData(px, 0, 0);
+
+  const canvas = document.getElementById("hm"), ctx = canvas.getContext("2d");
+  const d0 = document.getElementById("d0"), d1 = document.getElementById("d1");
+  const eos = document.getElementById("eos");
+  if (!P.lines.eos) document.getElementById("eos-label").style.display = "none";
+  const iso = d => new Date(d * DAY).toISOString().slice(0, 10);
+  const fromIso = s => Math.round(Date.parse(s) / DAY);
+  d0.min = d1.min = iso(P.x0); d0.max = d1.max = iso(P.x1);
+  let view = P.view.slice();
+
+  function setView(a, b) {
+    const span = Math.max(Math.min(b - a, P.x1 - P.x0), 24);
+    a = Math.min(Math.max(a, P.x0), P.x1 - span);
+    view = [a, a + span];
+    d0.value = iso(Math.round(view[0])); d1.value = iso(Math.round(view[1]));
+    draw();
+  }
+  const plotW = () => canvas.width - M.l - M.r, plotH = () => H - M.t - M.b;
+  const xpx = d => M.l + (d - view[0]) / (view[1] - view[0]) * plotW();
+  const ypx = v => H - M.b - (v - P.ymin) / (P.ymax - P.ymin) * plotH();
+
+  function niceTicks(lo, hi, n) {
+    const raw = (hi - lo) / n, mag = Math.pow(10, Math.floor(Math.log10(raw)));
+    const step = [1, 2, 5, 10].map(m => m * mag).find(s => s >= raw);
+    const ticks = [];
+    for (let v = Math.ceil(lo / step) * step; v <= hi + 1e-9; v += step) ticks.push(v);
+    return ticks;
+  }
+
+  function draw() {
+    const W = canvas.width, pw = plotW(), ph = plotH();
+    ctx.clearRect(0, 0, W, H);
+    ctx.save();
+    ctx.beginPath(); ctx.rect(M.l, M.t, pw, ph); ctx.clip();
+    // only the source columns in view are scaled onto the plot
+    const colW = (P.x1 - P.x0) / P.cols;
+    const c0 = Math.max(0, Math.floor((view[0] - P.x0) / colW)), c1 = Math.min(P.cols, Math.ceil((view[1] - P.x0) / colW));
+    if (c1 > c0) {
+      ctx.imageSmoothingEnabled = false;
+      const x0 = xpx(P.x0 + c0 * colW), x1 = xpx(P.x0 + c1 * colW);
+      ctx.drawImage(img, c0, 0, c1 - c0, P.rows, x0, M.t, x1 - x0, ph);
+    }
+    const lines = (eos.checked && P.lines.eos) ? P.lines.eos : P.lines.raw;
+    ctx.strokeStyle = "black"; ctx.lineWidth = 1;
+    for (const ln of lines) {
+      ctx.setLineDash(ln.dashed ? [6, 3, 1, 3] : []);
+      ctx.beginPath();
+      let pen = false;
+      for (let i = 0; i < ln.x.length; i++) {
+        if (ln.y[i] === null || ln.x[i] < view[0] - 30 || ln.x[i] > view[1] + 30) { pen = false; continue; }
+        const x = xpx(ln.x[i]), y = ypx(ln.y[i]);
+        if (pen) ctx.lineTo(x, y); else ctx.moveTo(x, y);
+        pen = true;
+      }
+      ctx.stroke();
+    }
+    ctx.restore();
+    ctx.setLineDash([]);
+
+    // frame, ticks and labels
+    ctx.strokeStyle = "black"; ctx.fillStyle = "black"; ctx.font = "12px sans-serif";
+    ctx.strokeRect(M.l, M.t, pw, ph);
+    ctx.textAlign = "right"; ctx.textBaseline = "middle";
+    for (const v of niceTicks(P.ymin, P.ymax, 5)) {
+      const y = ypx(v);
+      ctx.beginPath(); ctx.moveTo(M.l - 4, y); ctx.lineTo(M.l, y); ctx.stroke();
+      ctx.fillText(+v.toFixed(6), M.l - 6, y);
+    }
+    ctx.textAlign = "center"; ctx.textBaseline = "top";
+    const y0 = new Date(view[0] * DAY).getUTCFullYear(), y1 = new Date(view[1] * DAY).getUTCFullYear();
+    const monthly = view[1] - view[0] < 730;
+    for (let yr = y0; yr <= y1; yr++) {
+      for (let m = 0; m < 12; m += monthly ? 1 : 12) {
+        const d = Date.UTC(yr, m, 1) / DAY;
+        if (d < view[0] || d > view[1]) continue;
+        const x = xpx(d);
+        ctx.beginPath(); ctx.moveTo(x, H - M.b); ctx.lineTo(x, H - M.b + 4); ctx.stroke();
+        ctx.fillText(monthly ? iso(d).slice(0, 7) : String(yr), x, H - M.b + 6);
+      }
+    }
+    ctx.font = "14px sans-serif"; ctx.textBaseline = "bottom";
+    ctx.fillText(P.title, M.l + pw / 2, M.t - 6);
+    ctx.save(); ctx.translate(14, M.t + ph / 2); ctx.rotate(-Math.PI / 2);
+    ctx.textBaseline = "middle"; ctx.font = "12px sans-serif"; ctx.fillText(P.ylabel, 0, 0); ctx.restore();
+
+    // legend
+    ctx.font = "12px sans-serif"; ctx.textAlign = "left"; ctx.textBaseline = "middle";
+    lines.forEach((ln, i) => {
+      const y = H - M.b - 12 - 16 * (lines.length - 1 - i), x = M.l + pw - 110;
+      ctx.fillStyle = "rgba(255,255,255,0.8)"; ctx.fillRect(x - 4, y - 8, 110, 16);
+      ctx.fillStyle = "black"; ctx.setLineDash(ln.dashed ? [6, 3, 1, 3] : []);
+      ctx.beginPath(); ctx.moveTo(x, y); ctx.lineTo(x + 24, y); ctx.stroke();
+      ctx.setLineDash([]); ctx.fillText(ln.label, x + 30, y);
+    });
+
+    // colorbar
+    const cx = W - M.r + 16, cw = 14;
+    for (let i = 0; i < 255; i++) {
+      ctx.fillStyle = `rgb(${colors[i].join(",")})`;
+      ctx.fillRect(cx, M.t + ph - (i + 1) / 255 * ph, cw, ph / 255 + 1);
+    }
+    ctx.strokeStyle = "black"; ctx.strokeRect(cx, M.t, cw, ph);
+    ctx.fillStyle = "black"; ctx.textAlign = "left";
+    for (const v of niceTicks(P.vmin, P.vmax, 5)) {
+      ctx.fillText(+v.toFixed(6), cx + cw + 4, M.t + ph - (v - P.vmin) / (P.vmax - P.vmin) * ph);
+    }
+    ctx.save(); ctx.translate(W - 12, M.t + ph / 2); ctx.rotate(-Math.PI / 2);
+    ctx.textAlign = "center"; ctx.fillText("Backscatter [dB]", 0, 0); ctx.restore();
+  }
+
+  function resize() { canvas.width = canvas.clientWidth; canvas.height = H; canvas.style.height = H + "px"; draw(); }
+  canvas.addEventListener("wheel", e => {
+    e.preventDefault();
+    const d = view[0] + (e.offsetX - M.l) / plotW() * (view[1] - view[0]);
+    const k = e.deltaY > 0 ? 1.2 : 1 / 1.2;
+    setView(d - (d - view[0]) * k, d + (view[1] - d) * k);
+  }, {passive: false});
+  let drag = null;
+  canvas.addEventListener("mousedown", e => { drag = {x: e.clientX, view: view.slice()}; canvas.style.cursor = "grabbing"; });
+  window.addEventListener("mouseup", () => { drag = null; canvas.style.cursor = "grab"; });
+  window.addEventListener("mousemove", e => {
+    if (!drag) return;
+    const shift = (drag.x - e.clientX) / plotW() * (drag.view[1] - drag.view[0]);
+    setView(drag.view[0] + shift, drag.view[1] + shift);
+  });
+  d0.addEventListener("change", () => { if (d0.value) setView(fromIso(d0.value), view[1]); });
+  d1.addEventListener("change", () => { if (d1.value) setView(view[0], fromIso(d1.value)); });
+  eos.addEventListener("change", draw);
+  document.getElementById("reset").addEventListener("click", () => setView(P.view[0], P.view[1]));
+  window.addEventListener("resize", resize);
+  resize();
+  setView(view[0], view[1]);
+})();
+</script>
+"""
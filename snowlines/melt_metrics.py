@@ -0,0 +1,118 @@
+"""Regional melt metrics loaded once and pre-aggregated into a subregion x year x direction cube."""
+import io
+
+import numpy as np
+import pandas as pd
+
+from snowlines.regional import MELT_EXTENT_CSV, read_member
+from snowlines.timing import span
+
+METRICS = {
+    "glacier_melt_days": "Melt days",
+    "doy_me_start_50": "Melt start (day of year)",
+    "doy_me_end_50": "Melt end (day of year)",
+    "tbias_opt": "Temperature bias (°C)",
+}
+DIMENSIONS = ("subregion", "year", "direction")
+UNASSIGNED = "Unassigned"
+
+
+def read_melt_metrics(raw: bytes = None) -> pd.DataFrame:
+    """The melt-extent table with categorical keys and float32 values."""
+    if raw is None:
+        raw = read_member(MELT_EXTENT_CSV)
+    df = pd.read_csv(io.BytesIO(raw))
+    df["subregion"] = df["subregion"].fillna(UNASSIGNED)
+    return df.astype({
+        "rgi_id": "category", "subregion": "category", "direction": "category", "pathrow": "category",
+        "year": "int16", "obs_per_yr": "int16", "area_km2": "float32",
+        **{m: "float32" for m in METRICS},
+    })
+
+
+class MeltCube:
+    """Area-weighted metric sums per subregion x year x direction, plus row indexes for drill-down."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.subregions = list(df["subregion"].cat.categories)
+        self.years = sorted(df["year"].unique().tolist())
+        self.directions = list(df["direction"].cat.categories)
+        shape = (len(self.subregions), len(self.years), len(self.directions))
+
+        s = df["subregion"].cat.codes.to_numpy()
+        y = np.searchsorted(self.years, df["year"].to_numpy())
+        d = df["direction"].cat.codes.to_numpy()
+        cell = np.ravel_multi_index((s, y, d), shape)
+
+        # each glacier-year-direction weighs its area once, however many pathrows saw it
+        n_rows = df.groupby(["rgi_id", "year", "direction"], observed=True)["area_km2"].transform("size").to_numpy()
+        weight = df["area_km2"].to_numpy(dtype=float) / n_rows
+        n_cells = int(np.prod(shape))
+        self.weighted = {}
+        self.weights = {}
+        for metric in METRICS:
+            x = df[metric].to_numpy(dtype=float)
+            valid = ~np.isnan(x)
+            self.weighted[metric] = np.bincount(cell[valid], (weight * x)[valid], n_cells).reshape(shape)
+            self.weights[metric] = np.bincount(cell[valid], weight[valid], n_cells).reshape(shape)
+        self.rows = np.bincount(cell, minlength=n_cells).reshape(shape)
+
+        # CSR-style indexes: rows of cell c are _cell_order[_cell_start[c]:_cell_start[c + 1]]
+        self._cell_order = np.argsort(cell, kind="stable")
+        self._cell_start = np.searchsorted(cell[self._cell_order], np.arange(n_cells + 1))
+        glacier = df["rgi_id"].cat.codes.to_numpy()
+        self._glacier_order = np.argsort(glacier, kind="stable")
+        self._glacier_start = np.searchsorted(glacier[self._glacier_order], np.arange(len(df["rgi_id"].cat.categories) + 1))
+        self._glacier_code = {rgi_id: i for i, rgi_id in enumerate(df["rgi_id"].cat.categories)}
+
+    @classmethod
+    def from_bundle(cls):
+        with span("melt cube"):
+            return cls(read_melt_metrics())
+
+    def _selection(self, subregions=None, years=None, directions=None):
+        """Index arrays along each cube axis; None keeps the whole axis."""
+        def pick(values, chosen):
+            if chosen is None:
+                return np.arange(len(values))
+            chosen = set(chosen)
+            return np.array([i for i, v in enumerate(values) if v in chosen], dtype=int)
+        return pick(self.subregions, subregions), pick(self.years, years), pick(self.directions, directions)
+
+    def table(self, metric: str, by=("subregion",), subregions=None, years=None, directions=None) -> pd.DataFrame:
+        """Area-weighted mean of `metric` grouped by any of DIMENSIONS, within the filters."""
+        sel = self._selection(subregions, years, directions)
+        sub = np.ix_(*sel)
+        weighted, weights, rows = self.weighted[metric][sub], self.weights[metric][sub], self.rows[sub]
+        drop = tuple(i for i, dim in enumerate(DIMENSIONS) if dim not in by)
+        weighted, weights, rows = weighted.sum(axis=drop), weights.sum(axis=drop), rows.sum(axis=drop)
+
+        labels = [np.asarray(values)[idx] for values, idx, dim in
+                  zip((self.subregions, self.years, self.directions), sel, DIMENSIONS) if dim in by]
+        kept = [dim for dim in DIMENSIONS if dim in by]
+        index = pd.MultiIndex.from_product(labels, names=kept) if kept else pd.RangeIndex(1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = weighted / weights
+        out = pd.DataFrame({
+            metric: np.ravel(mean),
+            "area_km2": np.ravel(weights),
+            "rows": np.ravel(rows),
+        }, index=index)
+        out = out[out["rows"] > 0]
+        return out.reset_index()[[*by, metric, "area_km2", "rows"]] if kept else out
+
+    def cell_rows(self, subregions=None, years=None, directions=None) -> pd.DataFrame:
+        """Glacier rows of the selected cells, read through the cell index."""
+        sel = self._selection(subregions, years, directions)
+        shape = self.rows.shape
+        cells = np.ravel_multi_index(np.meshgrid(*sel, indexing="ij"), shape).ravel()
+        idx = [self._cell_order[self._cell_start[c]:self._cell_start[c + 1]] for c in cells]
+        return self.df.iloc[np.sort(np.concatenate(idx))] if idx else self.df.iloc[:0]
+
+    def glacier_rows(self, rgi_id: str) -> pd.DataFrame:
+        """All rows of one glacier, read through the glacier index."""
+        code = self._glacier_code.get(rgi_id)
+        if code is None:
+            return self.df.iloc[:0]
+        return self.df.iloc[self._glacier_order[self._glacier_start[code]:self._glacier_start[code + 1]]]
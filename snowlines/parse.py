@@ -0,0 +1,154 @@
+"""Member naming and CSV parsing for the per-glacier data zips."""
+import io
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from snowlines.timing import span, submit
+
+SL_KEY = "snowline_elev_percentile"
+VARIANTS = ("elev", "area")  # equal elevation bins, equal area ("eabin") bins
+
+# pandas' default missing-value markers (empty, NaN, NA, null, ...), as plain read_csv reads them
+_CSV_OPTS = dict(float_precision="legacy")
+
+
+# per SAR pathrow, an inner {rgi_no}.zip holds <prefix>_snowline_elev_percentile_<pathrow>.csv and the
+# matching melt_extent_elev_percentile, db_bin_mean and hypsometry files; area-bin variants end in
+# _eabin.csv and end-of-summer corrected percentiles have _eos_corr after "percentile"
+def pathrow_members(names, variant: str = "elev", eos_corr: bool = False):
+    """List of (pathrow, {"sl", "me", "db", "hyps": member name}) for one glacier zip."""
+    members = []
+    for fname in names:
+        if SL_KEY not in fname or "eos_corr" in fname:
+            continue
+        if ("eabin" in fname) != (variant == "area"):
+            continue
+        pathrow = fname.split(f"_{SL_KEY}_")[-1][:-len("_eabin.csv" if variant == "area" else ".csv")]
+        if eos_corr:
+            sl = fname.replace("percentile", "percentile_eos_corr")
+            me = fname.replace(SL_KEY, "melt_extent_elev_percentile_eos_corr")
+        else:
+            sl = fname
+            me = fname.replace("snowline", "melt_extent")
+        members.append((pathrow, {
+            "sl": sl,
+            "me": me,
+            "db": fname.replace(SL_KEY, "db_bin_mean"),
+            "hyps": fname.replace(SL_KEY, "hypsometry"),
+        }))
+    return members
+
+
+def _header_dates(raw: bytes):
+    """Parse the date header of a db_bin_mean CSV once into a datetime64[ns] vector."""
+    header = raw[:raw.find(b"\n")].rstrip(b"\r").split(b",")[1:]
+    try:
+        dates = np.array([h.strip(b'"').decode() for h in header], dtype="datetime64[D]")
+    except ValueError:  # not ISO formatted, let pandas work it out
+        dates = pd.to_datetime([h.strip(b'"').decode() for h in header]).values
+    return dates.astype("datetime64[ns]")
+
+
+def read_series(raw: bytes):
+    """Dates (datetime64[ns]) and first-column values of a percentile CSV."""
+    df = pd.read_csv(io.BytesIO(raw), header=None, skiprows=1, usecols=[0, 1], dtype={0: "S10"}, **_CSV_OPTS)
+    dates = df[0].to_numpy().astype("S10").astype("datetime64[D]").astype("datetime64[ns]")
+    return dates, df[1].to_numpy(dtype=float)
+
+
+def read_db_bin(raw: bytes):
+    """Dates (columns) and the (bins x dates) backscatter matrix of a db_bin_mean CSV."""
+    # the matrix is a few dozen rows by hundreds of date columns, which the csv
+    # tokenizer handles poorly; reading it as one long column and reshaping is ~2.5x faster
+    header_end = raw.find(b"\n")
+    n_cols = raw[:header_end].count(b",") + 1
+    # blank lines are skipped, as read_csv does, so they can't shift the reshape
+    body = re.sub(rb"\n\n+", b"\n", raw[header_end + 1:].replace(b"\r", b"")).strip(b"\n")
+    if not body:
+        return _header_dates(raw), np.empty((0, n_cols - 1))
+    body = body.replace(b",", b"\n")
+    values = pd.read_csv(io.BytesIO(body), header=None, skip_blank_lines=False, dtype=float, **_CSV_OPTS)[0].to_numpy()
+    # the parser drops empty fields at the very end of the file
+    values = np.pad(values, (0, body.count(b"\n") + 1 - values.size), constant_values=np.nan)
+    return _header_dates(raw), values.reshape(-1, n_cols)[:, 1:]
+
+
+def read_hypsometry(raw: bytes):
+    """Bin centers and binned area of a hypsometry CSV."""
+    df = pd.read_csv(io.BytesIO(raw), index_col=0)
+    return df.index.to_numpy(dtype=float), df.iloc[:, 0].to_numpy(dtype=float)
+
+
+_READERS = {"sl": read_series, "me": read_series, "sl_eos": read_series, "me_eos": read_series,
+            "db": read_db_bin, "hyps": read_hypsometry}
+_NO_DATES, _NO_VALUES = np.empty(0, dtype="datetime64[ns]"), np.empty(0)
+
+
+def _read_member(zip_bytes: bytes, name: str, kind: str):
+    # every task opens its own ZipFile over the shared (uncopied) bytes
+    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as gzf:
+        with span("unzip"):
+            raw = gzf.read(name)
+    with span("parse"):
+        return _READERS[kind](raw)
+
+
+def _parse(zip_bytes: bytes, members, max_workers: int):
+    """Parse [(pathrow, {kind: member name})] concurrently into one dict of arrays per pathrow."""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [{kind: submit(pool, _read_member, zip_bytes, name, kind) for kind, name in files.items()}
+                   for _, files in members]
+        result = []
+        for (pathrow, _), parts in zip(members, futures):
+            dates, db_bin = parts["db"].result()
+            bins_center, binned_area = parts["hyps"].result()
+            data = {"pathrow": pathrow, "dates": dates, "db_bin": db_bin,
+                    "bins_center": bins_center, "binned_area": binned_area}
+            for kind in ("sl", "me", "sl_eos", "me_eos"):
+                if kind in parts:
+                    data[f"{kind}_dates"], data[kind] = parts[kind].result()
+            result.append(data)
+    return result
+
+
+def parse_glacier(zip_bytes: bytes, variant: str = "elev", eos_corr: bool = False, max_workers: int = 8):
+    """Decompress and parse all members of one glacier zip concurrently.
+
+    Returns one dict of arrays per pathrow (pathrow, dates, db_bin, bins_center,
+    binned_area, sl_dates, sl, me_dates, me).
+    """
+    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as gzf:
+        members = pathrow_members(gzf.namelist(), variant, eos_corr)
+    return _parse(zip_bytes, members, max_workers)
+
+
+def parse_all(zip_bytes: bytes, max_workers: int = 8):
+    """Every variant of one glacier zip, raw and end-of-summer corrected, in one concurrent pass.
+
+    Returns {variant: [dict per pathrow]} with the parse_glacier fields plus
+    sl_eos_dates, sl_eos, me_eos_dates and me_eos (empty if the zip has no corrected files).
+    """
+    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as gzf:
+        names = gzf.namelist()
+    present = set(names)
+    plan = {}
+    for variant in VARIANTS:
+        plan[variant] = [(pathrow, {**files, **{f"{kind}_eos": eos_files[kind] for kind in ("sl", "me")
+                                                if eos_files[kind] in present}})
+                         for (pathrow, files), (_, eos_files) in zip(pathrow_members(names, variant),
+                                                                     pathrow_members(names, variant, eos_corr=True))]
+    # one pool for both variants keeps every worker busy
+    members = [entry for variant in VARIANTS for entry in plan[variant]]
+    parsed = iter(_parse(zip_bytes, members, max_workers))
+    result = {}
+    for variant in VARIANTS:
+        result[variant] = [next(parsed) for _ in plan[variant]]
+        for data in result[variant]:
+            for kind in ("sl_eos", "me_eos"):
+                data.setdefault(f"{kind}_dates", _NO_DATES)
+                data.setdefault(kind, _NO_VALUES)
+    return result
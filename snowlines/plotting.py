@@ -0,0 +1,102 @@
+"""Backscatter heatmaps on object-oriented Agg figures, safe to render from a worker pool."""
+import time
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from snowlines.figcache import figure_png
+from snowlines.regrid import regrid_12d
+from snowlines.timing import record, span
+
+ELEV_LABEL = 'Elevation [m a.s.l.]'
+AREA_LABEL = r'Cumulative area [$km^2$]'
+
+
+def plot_db_heatmap(db_bin, dates, bins_center, binned_area, set_ymin, set_ymax, glacno, cmap='RdYlBu', 
+                    cbar_label='Backscatter [dB]', ylabel=ELEV_LABEL, glac_name_dict={}, figsize=(9,6), 
+                    bins2plot_lowerquantile=2, bins2plot_upperquantile=98, frame_cut=0, title_info='', **kwargs):
+    """" Heatmap plotting function """
+    try:
+        with span("regrid"):
+            dates_12d, db_bin_12d, _ = regrid_12d(db_bin, dates, frame_cut=frame_cut)
+    except IndexError:
+        return f"Dates exceed data bounds for glacier {glacno+title_info}"
+
+    t0 = time.perf_counter()
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+
+    dbmin = np.nanpercentile(db_bin, 2)
+    dbmax = np.nanpercentile(db_bin, 98)
+
+    bin_sizes = np.diff(bins_center)
+    bin_halfsize = bin_sizes[0]/2
+    if ylabel == ELEV_LABEL:
+        assert np.all(bin_sizes == bin_sizes[0]) == True, 'Elevation bins are not regularly spaced.'
+
+    cax = ax.imshow(db_bin_12d, cmap=cmap, vmin=dbmin, vmax=dbmax, interpolation='nearest', aspect='auto', 
+                    origin='lower', extent=[dates_12d[0], dates_12d[-1], set_ymin, set_ymax])
+
+    # plot additional data from **kwargs
+    line_plot = kwargs.get('line_plot', [])
+    if line_plot:
+        for data in line_plot:
+            x, y, c, ls, lw, label = data
+            ax.plot(x, y, c=c, ls=ls, lw=lw, label=label)
+        ax.legend(loc='lower right')
+
+    # label by glacier number or name, if available
+    if glacno in glac_name_dict.keys():
+        glac_name = glac_name_dict[glacno]
+    else:
+        glac_name = str(glacno)
+    ax.set_title(glac_name+title_info)
+    ax.set_ylabel(ylabel)
+    ax.set_xlim([dates_12d[0], dates_12d[-1]])
+    ax.set_ylim([set_ymin, set_ymax])
+    cbar = fig.colorbar(cax, orientation='vertical', label=cbar_label)
+
+    record("plot", time.perf_counter() - t0)
+    return fig
+
+
+def dates_filter_for_plotting(dates, db_bin, date_start='2017-01-01', date_end='2025-01-01'):
+    mask = (dates >= np.datetime64(date_start)) & (dates < np.datetime64(date_end))
+    return dates[mask], db_bin[:, mask]
+
+
+def pathrow_axes(data, variant: str = "elev"):
+    """Y extent, y label and the (dates, values, style, label) melt extent / snowline lines of a pathrow."""
+    glac_zbins_center = data["bins_center"]
+    binned_area = data["binned_area"]
+    dates_per = data["me_dates"]
+    dates_sl_per = data["sl_dates"]
+    if variant == "area":
+        # cumulative area in km2; snowline shares the melt extent dates
+        set_ymin, set_ymax = 0, np.sum(binned_area)/1e6
+        me_elev_per = data["me"]/1e6
+        sl_elev_per = data["sl"]/1e6
+        dates_sl_per = dates_per
+        ylabel = AREA_LABEL
+    else:
+        glac_bin_halfsize = np.diff(glac_zbins_center)[0]/2
+        set_ymin, set_ymax = glac_zbins_center[0]-glac_bin_halfsize, glac_zbins_center[-1]+glac_bin_halfsize
+        me_elev_per = data["me"]
+        sl_elev_per = data["sl"]
+        ylabel = ELEV_LABEL
+    lines = [(dates_per, me_elev_per, '-', 'Melt extent'), (dates_sl_per, sl_elev_per, '-.', 'Snowline')]
+    return set_ymin, set_ymax, ylabel, lines
+
+
+def render_pathrow(data, rgi_no: str, variant: str = "elev", date_start='2017-01-01', date_end='2025-01-01'):
+    """Render one pathrow's heatmap (elevation or area bins) to PNG bytes, or return an error message."""
+    dates, glac_binned_data = dates_filter_for_plotting(data["dates"], data["db_bin"],
+                                                        date_start=date_start, date_end=date_end)
+    set_ymin, set_ymax, ylabel, lines = pathrow_axes(data, variant)
+    fig = plot_db_heatmap(db_bin=glac_binned_data, dates=dates, bins_center=data["bins_center"],
+                          binned_area=data["binned_area"], set_ymin=set_ymin, set_ymax=set_ymax, ylabel=ylabel,
+                          glacno=rgi_no, title_info=f" (pathrow: {data['pathrow']})", figsize=(12, 4),
+                          line_plot=[(x, y, 'k', ls, 0.7, label) for x, y, ls, label in lines])
+    if isinstance(fig, str):
+        return fig
+    return figure_png(fig)
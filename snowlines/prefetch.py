@@ -0,0 +1,99 @@
+"""Bounded background prefetch of a glacier's data and animation zips into the disk cache
+(SNOWLINES_PREFETCH_WORKERS, 0 turns it off)."""
+import logging
+import os
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from snowlines.cache import get_cache
+from snowlines.zenodo import animation_url, fetch_animation_zip, fetch_glacier_zip, glacier_zip_key
+
+PREFETCH_WORKERS = int(os.environ.get("SNOWLINES_PREFETCH_WORKERS", 2))
+MAX_PENDING = 8
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """Bounded, deduplicated background fetches into the disk cache, cancellable per glacier."""
+
+    def __init__(self, max_workers: int = PREFETCH_WORKERS, max_pending: int = MAX_PENDING):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self.max_pending = max_pending
+        self.jobs = OrderedDict()  # key -> (group, Future), oldest first
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, event: str, n: int = 1):
+        with self._lock:
+            self.counts[event] += n
+
+    def _run(self, key, fetch):
+        try:
+            fetch()
+            self._count("fetched")
+        except Exception:  # the page will retry and report it
+            self._count("failed")
+            logger.warning("prefetch of %s failed", key, exc_info=True)
+
+    def submit(self, key: str, fetch, group: str = None):
+        """Run `fetch()` in the background unless `key` is cached, queued or running; the Future or None."""
+        if key in get_cache():
+            self._count("cached")
+            return None
+        with self._lock:
+            for done in [k for k, (_, future) in self.jobs.items() if future.done()]:
+                del self.jobs[done]
+            if key in self.jobs:
+                self.counts["deduplicated"] += 1
+                return self.jobs[key][1]
+            waiting = [k for k, (_, future) in self.jobs.items() if not future.running()]
+            for oldest in waiting[:max(len(waiting) - self.max_pending + 1, 0)]:
+                if self.jobs.pop(oldest)[1].cancel():
+                    self.counts["cancelled"] += 1
+            future = self.pool.submit(self._run, key, fetch)
+            self.jobs[key] = (group, future)
+            self.counts["submitted"] += 1
+            return future
+
+    def cancel(self, group: str) -> int:
+        """Cancel the queued fetches of `group`; returns how many were cancelled."""
+        with self._lock:
+            cancelled = [k for k, (g, future) in self.jobs.items() if g == group and future.cancel()]
+            for key in cancelled:
+                del self.jobs[key]
+            self.counts["cancelled"] += len(cancelled)
+        return len(cancelled)
+
+    def stats(self) -> dict:
+        with self._lock:
+            running = sum(future.running() for _, future in self.jobs.values())
+            queued = sum(not future.running() and not future.done() for _, future in self.jobs.values())
+            return {**self.counts, "running": running, "queued": queued}
+
+
+@lru_cache(maxsize=1)
+def get_prefetcher():
+    """Process-wide prefetcher shared by all sessions, or None if prefetching is off."""
+    return Prefetcher() if PREFETCH_WORKERS > 0 else None
+
+
+def prefetch_glacier(rgi_no: str, short_name: str = ""):
+    """Queue the inner data zip and the animation zip of one glacier; group = rgi_no."""
+    prefetcher = get_prefetcher()
+    if prefetcher is None:
+        return
+    key = glacier_zip_key(rgi_no)
+    if key is not None:
+        prefetcher.submit(key, lambda: fetch_glacier_zip(rgi_no), group=rgi_no)
+    url = animation_url(short_name, rgi_no[-5:]) if short_name else None
+    if url is not None:
+        prefetcher.submit(url, lambda: fetch_animation_zip(url), group=rgi_no)
+
+
+def cancel_glacier(rgi_no: str):
+    """Cancel whatever of `rgi_no` is still queued."""
+    prefetcher = get_prefetcher()
+    return 0 if prefetcher is None else prefetcher.cancel(rgi_no)
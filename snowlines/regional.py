@@ -0,0 +1,108 @@
+"""The regional melt-extent and snowline bundle, read from data/ and optionally refreshed
+from GitHub in the background (SNOWLINES_REGIONAL_REFRESH=1)."""
+import io
+import logging
+import os
+import tempfile
+import threading
+import zipfile
+from functools import lru_cache
+
+from snowlines.cache import CACHE_DIR
+
+REGIONAL_ZIP = os.path.join("data", "regional_me_sl.zip")
+REGIONAL_URL = "https://raw.githubusercontent.com/albinwwells/AlaskaSnowlines/main/data/regional_me_sl.zip"
+REFRESHED_ZIP = os.path.join(CACHE_DIR, "regional_me_sl.zip")
+REGIONAL_REFRESH = os.environ.get("SNOWLINES_REGIONAL_REFRESH", "") == "1"
+MELT_EXTENT_CSV = "regional_me_sl/glacier_meltextent_output.csv"
+SNOWLINE_FRACTIONS_CSV = "regional_me_sl/regional_snowline_fractions.csv"
+
+logger = logging.getLogger(__name__)
+_refresh_lock = threading.Lock()
+_refresh_thread = None
+
+
+def _members(zip_file) -> set:
+    with zipfile.ZipFile(zip_file) as zf:
+        if zf.testzip() is not None:  # first member with a bad CRC
+            raise zipfile.BadZipFile("CRC mismatch")
+        return set(zf.namelist())
+
+
+@lru_cache(maxsize=8)
+def _verified(path: str, mtime_ns: int, size: int) -> bool:
+    """Whether the zip at `path` is intact and has every member of the bundled copy (cached per file version)."""
+    try:
+        members = _members(path)
+        return path == REGIONAL_ZIP or members >= _members(REGIONAL_ZIP)
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+def _is_valid(path: str) -> bool:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return _verified(path, st.st_mtime_ns, st.st_size)
+
+
+def regional_zip_path() -> str:
+    """The refreshed copy if there is a valid one, else the bundled file."""
+    return REFRESHED_ZIP if _is_valid(REFRESHED_ZIP) else REGIONAL_ZIP
+
+
+@lru_cache(maxsize=2)
+def _read(path: str, mtime_ns: int) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def read_regional_zip() -> bytes:
+    """Bytes of the bundle, read from disk once per file version."""
+    path = regional_zip_path()
+    return _read(path, os.stat(path).st_mtime_ns)
+
+
+def read_member(name: str) -> bytes:
+    """One uncompressed file of the bundle, e.g. MELT_EXTENT_CSV."""
+    with zipfile.ZipFile(io.BytesIO(read_regional_zip())) as zf:
+        return zf.read(name)
+
+
+def refresh(url: str = REGIONAL_URL) -> bool:
+    """Download the remote bundle and keep it if it verifies; True if a new copy was stored."""
+    from snowlines import http_client
+
+    response = http_client.get(url)
+    try:
+        if not _members(io.BytesIO(response.content)) >= _members(REGIONAL_ZIP):
+            return False
+    except zipfile.BadZipFile:
+        return False
+    if response.content == read_regional_zip():
+        return False
+    os.makedirs(os.path.dirname(REFRESHED_ZIP), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(REFRESHED_ZIP), suffix=".zip")
+    with os.fdopen(fd, "wb") as f:
+        f.write(response.content)
+    os.chmod(tmp, 0o644)  # mkstemp creates 0600
+    os.replace(tmp, REFRESHED_ZIP)
+    return True
+
+
+def start_background_refresh(url: str = REGIONAL_URL):
+    """Run `refresh` once per process on a daemon thread if SNOWLINES_REGIONAL_REFRESH=1."""
+    global _refresh_thread
+    if not REGIONAL_REFRESH:
+        return None
+    with _refresh_lock:
+        if _refresh_thread is None:
+            def run():
+                try:
+                    refresh(url)
+                except Exception:  # keep serving the local copy
+                    logger.warning("regional bundle refresh failed", exc_info=True)
+            _refresh_thread = threading.Thread(target=run, name="regional-refresh", daemon=True)
+            _refresh_thread.start()
+    return _refresh_thread
@@ -0,0 +1,28 @@
+"""Regridding of irregular SAR acquisitions onto a regular date grid."""
+import numpy as np
+
+
+def regrid_12d(db_bin, dates, frame_cut: int = 0, freq_days: int = 12):
+    """Place the columns of `db_bin` on a regular `freq_days` grid from dates[frame_cut] to dates[-1].
+
+    Grid dates without an exact acquisition stay NaN; where a date appears more
+    than once, its first column is used. Returns the grid (datetime64[ns]), the
+    (bins x grid) array and the boolean mask of grid dates that were matched.
+    Raises IndexError if `frame_cut` is outside `dates`.
+    """
+    dates = np.asarray(dates).astype("datetime64[ns]")
+    first, last = dates[frame_cut], dates[-1]
+    step = np.timedelta64(freq_days, "D")
+    n_steps = max((last - first) // step + 1, 0)
+    # grid dates are whole days, as in the original strftime-based loop
+    grid = (first + step * np.arange(n_steps)).astype("datetime64[D]").astype("datetime64[ns]")
+
+    # first occurrence of each grid date via a stable sort + left searchsorted
+    order = np.argsort(dates, kind="stable")
+    sorted_dates = dates[order]
+    pos = np.minimum(np.searchsorted(sorted_dates, grid, side="left"), len(dates) - 1)
+    matched = sorted_dates[pos] == grid
+
+    db_bin_12d = np.full((db_bin.shape[0], len(grid)), np.nan)
+    db_bin_12d[:, matched] = db_bin[:, order[pos[matched]]]
+    return grid, db_bin_12d, matched
@@ -0,0 +1,167 @@
+"""Read single members out of a remote zip archive using HTTP Range requests."""
+import io
+import zipfile
+
+from snowlines import http_client
+
+TAIL_BYTES = (1 << 16) + 22  # max zip comment + end-of-central-directory record
+MIN_FETCH = 64 * 1024        # smallest range request issued for a cache miss
+LOCAL_HEADER_SLACK = 1024    # local extra fields can be longer than the central ones
+MAX_SPAN = 64 * 1024 * 1024  # largest range one request covers when reading many members
+MAX_GAP = 1024 * 1024        # unneeded bytes read through rather than starting a new request
+
+
+class RangeFile(io.RawIOBase):
+    """Read-only, seekable file object backed by HTTP Range requests."""
+
+    def __init__(self, url: str, tail_bytes: int = TAIL_BYTES):
+        self.url = url
+        self.pos = 0
+        self.blocks = []  # (start, bytes) pairs already fetched
+        self.requests_made = 0
+        self.bytes_fetched = 0
+
+        # suffix range: gives the archive tail (central directory) and the total size
+        response = self._get({"Range": f"bytes=-{tail_bytes}"})
+        if response.status_code == 206:
+            self.size = int(response.headers["Content-Range"].rsplit("/", 1)[-1])
+            self.ranged = True
+        else:
+            # server doesn't support ranges, so we already hold the whole file
+            self.size = len(response.content)
+            self.ranged = False
+        self.blocks.append((self.size - len(response.content), response.content))
+
+    @property
+    def content(self):
+        """The whole archive, if the server ignored the Range header; otherwise None."""
+        return None if self.ranged else self.blocks[0][1]
+
+    def _get(self, headers):
+        response = http_client.get(self.url, headers=headers)
+        self.requests_made += 1
+        self.bytes_fetched += len(response.content)
+        return response
+
+    def _cached(self, start: int, end: int):
+        for block_start, block in self.blocks:
+            if block_start <= start and end <= block_start + len(block):
+                return block[start - block_start:end - block_start]
+        return None
+
+    def prefetch(self, start: int, end: int):
+        """Fetch bytes [start, end) in a single request unless already cached."""
+        start, end = max(start, 0), min(end, self.size)
+        if start >= end or self._cached(start, end) is not None:
+            return
+        response = self._get({"Range": f"bytes={start}-{end - 1}"})
+        if response.status_code != 206:
+            raise IOError(f"Server stopped honouring Range requests for {self.url}")
+        self.blocks.append((start, response.content))
+
+    def release(self):
+        """Drop fetched blocks except the first (the archive tail, or the whole file)."""
+        del self.blocks[1:]
+
+    # ---------------- file object interface used by zipfile ----------------
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self.pos = offset
+        elif whence == io.SEEK_CUR:
+            self.pos += offset
+        elif whence == io.SEEK_END:
+            self.pos = self.size + offset
+        return self.pos
+
+    def read(self, n=-1):
+        if n is None or n < 0:
+            n = self.size - self.pos
+        end = min(self.pos + n, self.size)
+        if self.pos >= end:
+            return b""
+        data = self._cached(self.pos, end)
+        if data is None:
+            self.prefetch(self.pos, max(end, self.pos + MIN_FETCH))
+            data = self._cached(self.pos, end)
+        self.pos = end
+        return data
+
+
+class RemoteZip:
+    """Minimal read-only view of a remote zip archive."""
+
+    def __init__(self, url: str):
+        self.file = RangeFile(url)
+        self.zf = zipfile.ZipFile(self.file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.zf.close()
+
+    @property
+    def bytes_fetched(self):
+        return self.file.bytes_fetched
+
+    @property
+    def content(self):
+        return self.file.content
+
+    def namelist(self):
+        return self.zf.namelist()
+
+    @staticmethod
+    def _member_end(info):
+        return (info.header_offset + zipfile.sizeFileHeader + len(info.orig_filename.encode())
+                + len(info.extra) + info.compress_size + LOCAL_HEADER_SLACK)
+
+    def read(self, name: str) -> bytes:
+        """Return the (decompressed) bytes of one member, fetched in a single range request."""
+        info = self.zf.getinfo(name)
+        self.file.prefetch(info.header_offset, self._member_end(info))
+        return self.zf.read(info)
+
+    def iter_members(self, names, max_span: int = MAX_SPAN, max_gap: int = MAX_GAP):
+        """Yield (name, bytes) of each member in archive order.
+
+        Neighbouring members share one range request of at most `max_span` bytes
+        (or one member, if larger), and each span is released once its members
+        are yielded, so memory stays at one span however many members are read.
+        """
+        infos = sorted((self.zf.getinfo(name) for name in names), key=lambda info: info.header_offset)
+        run, start, end = [], 0, 0
+        for info in infos + [None]:
+            if run and (info is None or info.header_offset - end > max_gap
+                        or self._member_end(info) - start > max_span):
+                self.file.prefetch(start, end)
+                for member in run:
+                    yield member.filename, self.zf.read(member)
+                self.file.release()
+                run = []
+            if info is None:
+                break
+            if not run:
+                start = info.header_offset
+            run.append(info)
+            end = self._member_end(info)
+
+
+def read_member(url: str, name: str):
+    """Fetch a single member of the zip at `url`; None if it isn't in the archive."""
+    with RemoteZip(url) as rz:
+        if name not in rz.namelist():
+            return None
+        return rz.read(name)
@@ -0,0 +1,100 @@
+"""Glacier name and RGI ID search over a trigram index, built once per process."""
+import bisect
+import re
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+from snowlines.catalog import load_catalog
+
+FUZZY_MIN_SCORE = 0.5  # share of the query's trigrams a fuzzy match must contain
+FUZZY_LIMIT = 20
+
+
+def rgi_no(rgi_id: str) -> str:
+    """RGI2000-v7.0-G-01-00570 -> 01.00570"""
+    return "01." + rgi_id[-5:]
+
+
+def _trigrams(text: str):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class GlacierIndex:
+    """Ranked search over (rgi_id, glac_name) pairs with O(1) id -> name lookup."""
+
+    def __init__(self, rgi_ids, names):
+        self.ids = list(rgi_ids)
+        self.names = ["" if pd.isna(n) else str(n) for n in names]
+        self._name = dict(zip(self.ids, self.names))
+        self._text = [f"{n}|{rid}|{rgi_no(rid)}".lower() for rid, n in zip(self.ids, self.names)]
+        self._exact = defaultdict(set)
+        self._grams = defaultdict(set)
+        tokens = []
+        for row, (rid, name, text) in enumerate(zip(self.ids, self.names, self._text)):
+            name = name.lower()
+            for key in (name, name.removesuffix(" glacier"), rid.lower(), rgi_no(rid), rid[-5:]):
+                if key:
+                    self._exact[key].add(row)
+            for gram in _trigrams(text):
+                self._grams[gram].add(row)
+            tokens += [(tok, row) for tok in re.split(r"[^a-z0-9.]+", text) if tok]
+        self._tokens = sorted(set(tokens))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def name(self, rgi_id: str) -> str:
+        return self._name.get(rgi_id, "")
+
+    def label(self, rgi_id: str) -> str:
+        """Selectbox label, e.g. 'RGI2000-v7.0-G-01-00570 – Gulkana Glacier'."""
+        return f"{rgi_id} – {self.name(rgi_id)}"
+
+    def _prefix_rows(self, query: str):
+        rows = set()
+        i = bisect.bisect_left(self._tokens, (query,))
+        while i < len(self._tokens) and self._tokens[i][0].startswith(query):
+            rows.add(self._tokens[i][1])
+            i += 1
+        return rows
+
+    def _fuzzy(self, query: str):
+        grams = _trigrams(query)
+        if not grams:
+            return []
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._grams.get(gram, ()))
+        scored = [(n / len(grams), row) for row, n in shared.items() if n / len(grams) >= FUZZY_MIN_SCORE]
+        scored.sort(key=lambda s: (-s[0], len(self.names[s[1]]), s[1]))
+        return [row for _, row in scored[:FUZZY_LIMIT]]
+
+    def search(self, query: str):
+        """RGI IDs matching `query`, best first."""
+        q = query.strip().lower()
+        if not q:
+            return []
+        exact = self._exact.get(q, set())
+        if len(q) < 3:
+            candidates = self._prefix_rows(q) | exact
+        else:
+            postings = sorted((self._grams.get(g, set()) for g in _trigrams(q)), key=len)
+            candidates = set.intersection(*postings) if postings else set()
+            candidates = {row for row in candidates if q in self._text[row]}
+        if not candidates:
+            # typo tolerance is for names; a mistyped ID number should not match its neighbours
+            return [self.ids[row] for row in self._fuzzy(q)] if re.search("[a-z]", q) else []
+
+        word_start = re.compile(r"(?<![a-z0-9])" + re.escape(q))
+        def rank(row):
+            tier = 0 if row in exact else 1 if word_start.search(self._text[row]) else 2
+            return tier, len(self.names[row]), row
+        return [self.ids[row] for row in sorted(candidates, key=rank)]
+
+
+def load_index(catalog: pd.DataFrame = None) -> GlacierIndex:
+    """Index the glaciers of the shared catalog."""
+    if catalog is None:
+        catalog = load_catalog()
+    return GlacierIndex(catalog["rgi_id"], catalog["glac_name"])
@@ -0,0 +1,164 @@
+"""Nearest-glacier queries on the sphere, with KD-trees over unit vectors."""
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from snowlines.catalog import load_catalog
+
+EARTH_RADIUS_KM = 6371.0088
+LEAF_SIZE = 32
+
+
+def to_xyz(lat, lon):
+    """Unit vectors (n, 3) for latitudes/longitudes in degrees."""
+    lat, lon = np.radians(np.asarray(lat, dtype=float)), np.radians(np.asarray(lon, dtype=float))
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+# chord length grows monotonically with great-circle distance, so 3-D searches are exact on the sphere
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1))
+
+
+def _km_to_chord(km):
+    return 2 * np.sin(min(km / EARTH_RADIUS_KM, np.pi) / 2)
+
+
+class SphereTree:
+    """KD-tree over unit vectors with k-nearest and radius queries in great-circle km."""
+
+    def __init__(self, lat, lon, leaf_size: int = LEAF_SIZE):
+        xyz = to_xyz(lat, lon)
+        self.order = np.arange(len(xyz))
+        self.nodes = []  # (lo, hi, left, right, start, end); leaves have left == -1
+        self._build(xyz, 0, len(xyz), leaf_size)
+        self.xyz = xyz[self.order]
+
+    def _build(self, xyz, start, end, leaf_size):
+        idx = self.order[start:end]
+        pts = xyz[idx]
+        node = len(self.nodes)
+        self.nodes.append(None)
+        lo, hi = tuple(pts.min(axis=0).tolist()), tuple(pts.max(axis=0).tolist())
+        if end - start <= leaf_size:
+            self.nodes[node] = (lo, hi, -1, -1, start, end)
+            return node
+        dim = int(np.argmax(np.subtract(hi, lo)))
+        self.order[start:end] = idx[np.argsort(pts[:, dim], kind="stable")]
+        mid = (start + end) // 2
+        left = self._build(xyz, start, mid, leaf_size)
+        right = self._build(xyz, mid, end, leaf_size)
+        self.nodes[node] = (lo, hi, left, right, start, end)
+        return node
+
+    @staticmethod
+    def _box_dist2(q, lo, hi):
+        # plain floats: numpy call overhead dominates for three coordinates
+        d2 = 0.0
+        for x, a, b in zip(q, lo, hi):
+            gap = a - x if x < a else x - b if x > b else 0.0
+            d2 += gap * gap
+        return d2
+
+    def query(self, lat: float, lon: float, k: int = 10):
+        """(distances in km, point indices) of the k nearest points, closest first; empty for k <= 0."""
+        k = min(k, len(self.order))
+        if k <= 0:
+            return np.empty(0), np.empty(0, dtype=self.order.dtype)
+        q = to_xyz(lat, lon)
+        qt = tuple(q.tolist())
+        best_d2, best_i = np.full(k, np.inf), np.full(k, -1)
+        heap = [(0.0, 0)]
+        while heap:
+            d2, node = heapq.heappop(heap)
+            if d2 > best_d2[-1]:
+                break
+            lo, hi, left, right, start, end = self.nodes[node]
+            if left == -1:
+                diff = self.xyz[start:end] - q
+                cand_d2 = np.concatenate([best_d2, np.einsum("ij,ij->i", diff, diff)])
+                cand_i = np.concatenate([best_i, self.order[start:end]])
+                keep = np.argsort(cand_d2, kind="stable")[:k]
+                best_d2, best_i = cand_d2[keep], cand_i[keep]
+                continue
+            for child in (left, right):
+                child_d2 = self._box_dist2(qt, *self.nodes[child][:2])
+                if child_d2 <= best_d2[-1]:
+                    heapq.heappush(heap, (child_d2, child))
+        found = best_i >= 0
+        return _chord_to_km(np.sqrt(best_d2[found])), best_i[found]
+
+    def query_radius(self, lat: float, lon: float, radius_km: float):
+        """(distances in km, point indices) of all points within `radius_km`, closest first."""
+        q = to_xyz(lat, lon)
+        qt = tuple(q.tolist())
+        r2 = _km_to_chord(radius_km) ** 2
+        hits_d2, hits_i = [], []
+        stack = [0]
+        while stack:
+            lo, hi, left, right, start, end = self.nodes[stack.pop()]
+            if self._box_dist2(qt, lo, hi) > r2:
+                continue
+            if left == -1:
+                diff = self.xyz[start:end] - q
+                d2 = np.einsum("ij,ij->i", diff, diff)
+                inside = d2 <= r2
+                hits_d2.append(d2[inside])
+                hits_i.append(self.order[start:end][inside])
+            else:
+                stack += [left, right]
+        d2 = np.concatenate(hits_d2) if hits_d2 else np.empty(0)
+        idx = np.concatenate(hits_i) if hits_i else np.empty(0, dtype=int)
+        order = np.argsort(d2, kind="stable")
+        return _chord_to_km(np.sqrt(d2[order])), idx[order]
+
+
+class GlacierLocator:
+    """One tree of centroids and one of termini, queried per glacier."""
+
+    def __init__(self, rgi_ids, cenlat, cenlon, termlat, termlon):
+        self.ids = list(rgi_ids)
+        self.trees = {}
+        for point, lat, lon in (("centroid", cenlat, cenlon), ("terminus", termlat, termlon)):
+            lat, lon = np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+            glacier = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+            self.trees[point] = (SphereTree(lat[glacier], lon[glacier]), glacier)
+
+    def _collect(self, to, query):
+        points = ("centroid", "terminus") if to == "either" else (to,)
+        hits = []
+        for point in points:
+            tree, glacier_of = self.trees[point]
+            dist, idx = query(tree)
+            hits += zip(dist.tolist(), glacier_of[idx].tolist(), [point] * len(dist))
+        hits.sort(key=lambda hit: hit[0])
+        found, seen = [], set()
+        for dist, glacier, point in hits:  # keep the closest point of each glacier
+            if glacier not in seen:
+                seen.add(glacier)
+                found.append((self.ids[glacier], dist, point))
+        return found
+
+    def nearest(self, lat: float, lon: float, k: int = 10, to: str = "centroid"):
+        """(rgi_id, distance_km, nearest point) of the k glaciers closest to (lat, lon), measured
+        to the centroid, terminus or either."""
+        # the k closest glaciers by either point are among the k closest of each kind
+        return self._collect(to, lambda tree: tree.query(lat, lon, k))[:max(k, 0)]
+
+    def within(self, lat: float, lon: float, radius_km: float, to: str = "centroid"):
+        """(rgi_id, distance_km, nearest point) of all glaciers within `radius_km`, closest first."""
+        return self._collect(to, lambda tree: tree.query_radius(lat, lon, radius_km))
+
+
+def load_locator(catalog: pd.DataFrame = None) -> GlacierLocator:
+    """Locator for the glaciers of the shared catalog."""
+    if catalog is None:
+        catalog = load_catalog()
+    return GlacierLocator(catalog["rgi_id"], catalog["cenlat"], catalog["cenlon"], catalog["termlat"], catalog["termlon"])
@@ -0,0 +1,184 @@
+"""Precomputed columnar store of every glacier's series, memory-mapped by readers
+(python -m snowlines.store --out data/store builds it)."""
+import argparse
+import io
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+
+import numpy as np
+
+from snowlines import http_client
+from snowlines.parse import VARIANTS, pathrow_members, read_db_bin, read_hypsometry, read_series
+from snowlines.zenodo import DATA_URL, load_rgi_index
+
+STORE_DIR = os.environ.get("SNOWLINES_STORE", os.path.join("data", "store"))
+
+logger = logging.getLogger(__name__)
+
+
+def _to_days(dates):
+    return dates.astype("datetime64[D]").astype(np.int32)
+
+
+# values.f32 holds all float32 data and days.i32 all dates as day offsets from 1970-01-01;
+# index.json maps {rgi_no: {variant: {pathrow: {field: [offset, *shape]}}}} into them
+class StoreWriter:
+    """Appends glaciers to a new store; the directory appears atomically on close()."""
+
+    def __init__(self, path: str = STORE_DIR):
+        self.path = path
+        self.tmp_path = tempfile.mkdtemp(prefix=".store-", dir=os.path.dirname(os.path.abspath(path)))
+        self.values = open(os.path.join(self.tmp_path, "values.f32"), "wb")
+        self.days = open(os.path.join(self.tmp_path, "days.i32"), "wb")
+        self.n_values = 0
+        self.n_days = 0
+        self.index = {}
+
+    def _put_values(self, arr):
+        arr = np.ascontiguousarray(arr, dtype="<f4")
+        arr.tofile(self.values)
+        offset, self.n_values = self.n_values, self.n_values + arr.size
+        return [offset, *arr.shape]
+
+    def _put_days(self, dates):
+        arr = np.ascontiguousarray(_to_days(dates), dtype="<i4")
+        arr.tofile(self.days)
+        offset, self.n_days = self.n_days, self.n_days + arr.size
+        return [offset, arr.size]
+
+    def add_glacier(self, rgi_no: str, zip_bytes: bytes):
+        """Parse every pathrow and variant of one inner glacier zip into the store."""
+        glacier = {}
+        with zipfile.ZipFile(io.BytesIO(zip_bytes)) as gzf:
+            names = set(gzf.namelist())
+            for variant in VARIANTS:
+                entries = {}
+                for (pathrow, files), (_, eos_files) in zip(pathrow_members(names, variant),
+                                                            pathrow_members(names, variant, eos_corr=True)):
+                    db_dates, db_bin = read_db_bin(gzf.read(files["db"]))
+                    bins, area = read_hypsometry(gzf.read(files["hyps"]))
+                    entry = {"db": self._put_values(db_bin), "db_days": self._put_days(db_dates),
+                             "bins": self._put_values(bins), "area": self._put_values(area)}
+                    for field, member in [("sl", files["sl"]), ("me", files["me"]),
+                                          ("sl_eos", eos_files["sl"]), ("me_eos", eos_files["me"])]:
+                        if member not in names:
+                            continue
+                        dates, values = read_series(gzf.read(member))
+                        entry[field] = self._put_values(values)
+                        entry[field + "_days"] = self._put_days(dates)
+                    entries[pathrow] = entry
+                if entries:
+                    glacier[variant] = entries
+        if glacier:
+            self.index[rgi_no] = glacier
+
+    def close(self):
+        self.values.close()
+        self.days.close()
+        with open(os.path.join(self.tmp_path, "index.json"), "w") as f:
+            json.dump(self.index, f)
+        if os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        os.chmod(self.tmp_path, 0o755)
+        os.replace(self.tmp_path, self.path)
+
+
+class GlacierStore:
+    """Read-only, memory-mapped view of a store built by StoreWriter."""
+
+    def __init__(self, path: str = STORE_DIR):
+        with open(os.path.join(path, "index.json"), "r") as f:
+            self.index = json.load(f)
+        self.values = self._map(os.path.join(path, "values.f32"), np.float32)
+        self.days = self._map(os.path.join(path, "days.i32"), np.int32)
+
+    @staticmethod
+    def _map(fp, dtype):
+        if os.path.getsize(fp) == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(fp, dtype=dtype, mode="r")
+
+    def __contains__(self, rgi_no):
+        return rgi_no in self.index
+
+    def _values(self, ref):
+        offset, *shape = ref
+        return self.values[offset:offset + int(np.prod(shape))].reshape(shape)
+
+    def _dates(self, ref):
+        offset, n = ref
+        return self.days[offset:offset + n].astype("datetime64[D]").astype("datetime64[ns]")
+
+    def load_all(self, rgi_no: str):
+        """Every variant of one glacier, raw and corrected, in the layout of parse.parse_all."""
+        result = {}
+        for variant, entries in self.index.get(rgi_no, {}).items():
+            result[variant] = []
+            for pathrow, entry in entries.items():
+                data = {"pathrow": pathrow, "dates": self._dates(entry["db_days"]), "db_bin": self._values(entry["db"]),
+                        "bins_center": self._values(entry["bins"]), "binned_area": self._values(entry["area"])}
+                for field in ("sl", "me", "sl_eos", "me_eos"):
+                    if field in entry:
+                        data[field + "_dates"], data[field] = self._dates(entry[field + "_days"]), self._values(entry[field])
+                    else:
+                        data[field + "_dates"], data[field] = np.empty(0, dtype="datetime64[ns]"), np.empty(0, dtype=np.float32)
+                result[variant].append(data)
+        return result
+
+
+def open_store(path: str = STORE_DIR):
+    """The store at `path`, or None if it hasn't been built."""
+    if not os.path.exists(os.path.join(path, "index.json")):
+        return None
+    return GlacierStore(path)
+
+
+# ---------------- ETL entry point ----------------
+def outer_archives(archives_dir, zip_names=None):
+    """Yield (name, path) of each outer archive (or of `zip_names`), downloading them one at a time if needed."""
+    for zip_name in sorted(set(load_rgi_index().values()) if zip_names is None else zip_names):
+        if archives_dir is not None:
+            fp = os.path.join(archives_dir, zip_name)
+            if os.path.exists(fp):
+                yield zip_name, fp
+            else:
+                logger.warning("%s: not found in %s, skipped", zip_name, archives_dir)
+            continue
+        with tempfile.NamedTemporaryFile(suffix=".zip") as tmp:
+            with http_client.get(DATA_URL.format(zip_name=zip_name), stream=True) as response:
+                for chunk in response.iter_content(chunk_size=1 << 20):
+                    tmp.write(chunk)
+            tmp.flush()
+            yield zip_name, tmp.name
+
+
+def build_store(out: str = STORE_DIR, archives_dir=None):
+    """Walk the outer archives once and write every glacier into a new store at `out`."""
+    writer = StoreWriter(out)
+    try:
+        for zip_name, fp in outer_archives(archives_dir):
+            with zipfile.ZipFile(fp) as zf:
+                members = [m for m in zf.namelist() if m.endswith(".zip")]
+                for member in members:
+                    writer.add_glacier(member[:-4], zf.read(member))
+            print(f"{zip_name}: {len(members)} glaciers", file=sys.stderr)
+    except BaseException:
+        writer.values.close()
+        writer.days.close()
+        shutil.rmtree(writer.tmp_path, ignore_errors=True)
+        raise
+    writer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the columnar glacier data store.")
+    parser.add_argument("--out", default=STORE_DIR, help="store directory to (re)create")
+    parser.add_argument("--archives", default=None,
+                        help="directory with local copies of the outer archives (default: download from Zenodo)")
+    args = parser.parse_args()
+    build_store(args.out, args.archives)
@@ -0,0 +1,113 @@
+"""Timing spans and byte counters per page run, optionally logged as JSON lines (SNOWLINES_TIMING_LOG)."""
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+TIMING_LOG = os.environ.get("SNOWLINES_TIMING_LOG", "")
+
+_current = contextvars.ContextVar("snowlines_timing_run", default=None)
+_log_lock = threading.Lock()
+
+
+class Stages:
+    """Thread-safe per-stage call counts and seconds, plus bytes and requests fetched over HTTP."""
+
+    def __init__(self):
+        self.stages = {}  # stage -> [calls, seconds]
+        self.bytes_fetched = 0
+        self.http_requests = 0
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            entry = self.stages.setdefault(stage, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def add_fetch(self, n_bytes: int):
+        with self._lock:
+            self.bytes_fetched += n_bytes
+            self.http_requests += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "stages": {stage: {"calls": calls, "ms": round(seconds * 1e3, 2)}
+                           for stage, (calls, seconds) in self.stages.items()},
+                "bytes_fetched": self.bytes_fetched,
+                "http_requests": self.http_requests,
+            }
+
+
+class Run(Stages):
+    """The stages of one script run of a page."""
+
+    def __init__(self, page: str):
+        super().__init__()
+        self.page = page
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.seconds = None
+
+    def summary(self) -> dict:
+        elapsed = self.seconds if self.seconds is not None else time.perf_counter() - self._t0
+        return {"page": self.page, "total_ms": round(elapsed * 1e3, 2), **super().summary()}
+
+
+process_totals = Stages()
+
+
+def start_run(page: str) -> Run:
+    """Begin collecting the spans of this script run."""
+    run = Run(page)
+    _current.set(run)
+    return run
+
+
+def finish_run(run: Run, **fields) -> dict:
+    """Close `run` and write it to the timing log if one is configured; returns its summary."""
+    run.seconds = time.perf_counter() - run._t0
+    record = {"time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(run.started)), **fields, **run.summary()}
+    if TIMING_LOG:
+        line = json.dumps(record) + "\n"
+        with _log_lock:
+            if TIMING_LOG == "-":
+                sys.stderr.write(line)
+            else:
+                with open(TIMING_LOG, "a") as f:
+                    f.write(line)
+    return record
+
+
+def record(stage: str, seconds: float):
+    process_totals.add(stage, seconds)
+    run = _current.get()
+    if run is not None:
+        run.add(stage, seconds)
+
+
+def fetched(n_bytes: int):
+    """Count one HTTP response body of `n_bytes`."""
+    process_totals.add_fetch(n_bytes)
+    run = _current.get()
+    if run is not None:
+        run.add_fetch(n_bytes)
+
+
+@contextmanager
+def span(stage: str):
+    """Time the enclosed block as one call of `stage`."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - t0)
+
+
+def submit(pool, fn, *args, **kwargs):
+    """pool.submit that keeps the caller's run, so spans in the worker count towards it."""
+    return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
@@ -0,0 +1,85 @@
+"""Locations of the glacier data on Zenodo and helpers to fetch it."""
+import io
+import json
+import os
+import zipfile
+from functools import lru_cache
+
+from snowlines import http_client
+from snowlines.cache import get_cache
+from snowlines.remote_zip import RemoteZip
+
+DATA_URL = "https://zenodo.org/records/17573252/files/{zip_name}?download=1"
+ANIMATION_URL = "https://zenodo.org/records/{record}/files/{name}_{rgi_id}.zip?download=1"
+
+# animation records are split by the first letter of the glacier name
+ANIMATION_RECORDS = [
+    ("A", "C", "17096302"),
+    ("D", "G", "17096311"),
+    ("H", "L", "17096339"),
+    ("M", "R", "17096340"),
+    ("S", "S", "17096370"),
+    ("T", "Z", "17096411"),
+]
+
+
+@lru_cache(maxsize=1)
+def load_rgi_index():
+    """Map of '{rgi_no}.zip' -> name of the outer Zenodo archive that contains it."""
+    json_path = os.path.join("data", "rgi_data_links.json")
+    with open(json_path, "r") as f:
+        return json.load(f)
+
+
+def archive_url(rgi_no: str):
+    """URL of the outer archive holding `rgi_no`, or None if the glacier has no data."""
+    zip_name = load_rgi_index().get((rgi_no + ".zip").strip())
+    if zip_name is None:
+        return None
+    return DATA_URL.format(zip_name=zip_name)
+
+
+def _read_inner_zip(zip_url: str, member: str):
+    cache = get_cache()
+    # a full copy of the outer archive is only cached when the server ignored ranges
+    outer = cache.get(zip_url)
+    if outer is not None:
+        with zipfile.ZipFile(io.BytesIO(outer)) as zf:
+            return zf.read(member) if member in zf.namelist() else None
+
+    with RemoteZip(zip_url) as rz:
+        if rz.content is not None:
+            cache.put(zip_url, rz.content)
+        if member not in rz.namelist():
+            return None
+        return rz.read(member)
+
+
+def glacier_zip_key(rgi_no: str):
+    """Disk-cache key of the inner {rgi_no}.zip, or None if the glacier has no data."""
+    zip_url = archive_url(rgi_no)
+    return None if zip_url is None else f"{zip_url}#{rgi_no}.zip"
+
+
+def fetch_glacier_zip(rgi_no: str):
+    """Bytes of the inner {rgi_no}.zip, from the disk cache or range-read from Zenodo."""
+    zip_url = archive_url(rgi_no)
+    if zip_url is None:
+        return None
+    member = f"{rgi_no}.zip"
+    return get_cache().get_or_fetch(glacier_zip_key(rgi_no), lambda: _read_inner_zip(zip_url, member))
+
+
+def animation_url(name: str, rgi_id: str):
+    """URL of the animation zip for a glacier (short name, last 5 digits of the RGI id)."""
+    for first, last, record in ANIMATION_RECORDS:
+        if first <= name[:1] <= last:
+            return ANIMATION_URL.format(record=record, name=name, rgi_id=rgi_id)
+    return None
+
+
+def fetch_animation_zip(url: str):
+    """Bytes of an animation zip, from the disk cache or downloaded from Zenodo."""
+    def download():
+        return http_client.get(url).content
+    return get_cache().get_or_fetch(url, download)
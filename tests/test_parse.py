@@ -0,0 +1,39 @@
+"""The bytes CSV readers against plain pd.read_csv, which the pages used before snowlines.parse."""
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from snowlines.parse import read_db_bin, read_series
+
+DB_BIN_CSVS = {
+    "plain": b",2017-01-01,2017-01-13\n1000.0,-12.5,-11.0\n1010.0,-13.0,-9.5\n",
+    "trailing blank line": b",2017-01-01,2017-01-13\n1000.0,-12.5,-11.0\n1010.0,-13.0,-9.5\n\n",
+    "blank lines and CRLF": b",2017-01-01,2017-01-13\r\n\r\n1000.0,-12.5,-11.0\r\n\r\n1010.0,-13.0,-9.5\r\n",
+    "no final newline": b",2017-01-01,2017-01-13\n1000.0,-12.5,-11.0\n1010.0,-13.0,-9.5",
+    "missing values": b",2017-01-01,2017-01-13\n1000.0,NA,\n1010.0,NaN,null\n1020.0,-9.5,\n",
+    "header only": b",2017-01-01,2017-01-13\n",
+}
+
+
+def legacy_db_bin(raw: bytes):
+    df = pd.read_csv(io.StringIO(raw.decode()), index_col=0)
+    return pd.to_datetime(df.columns).values.astype("datetime64[ns]"), df.to_numpy(dtype=float)
+
+
+@pytest.mark.parametrize("raw", DB_BIN_CSVS.values(), ids=DB_BIN_CSVS.keys())
+def test_read_db_bin_matches_read_csv(raw):
+    dates, values = read_db_bin(raw)
+    legacy_dates, legacy_values = legacy_db_bin(raw)
+    assert np.array_equal(dates, legacy_dates)
+    assert values.shape == legacy_values.shape
+    assert np.array_equal(values, legacy_values, equal_nan=True)
+
+
+def test_read_series_missing_values():
+    raw = b"date,p50\n2017-01-01,NaN\n2017-01-02,\n2017-01-03,NA\n2017-01-04,1200.5\n"
+    dates, values = read_series(raw)
+    legacy = pd.read_csv(io.StringIO(raw.decode()), index_col=0)
+    assert np.array_equal(dates, pd.to_datetime(legacy.index).values.astype("datetime64[ns]"))
+    assert np.array_equal(values, legacy.iloc[:, 0].to_numpy(dtype=float), equal_nan=True)
@@ -0,0 +1,55 @@
+"""regrid_12d against the loop plot_db_heatmap used before snowlines.regrid."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_regrid import legacy_regrid, synthetic_record
+from snowlines.regrid import regrid_12d
+
+
+def assert_same_as_legacy(db_bin, dates, frame_cut=0):
+    legacy_grid, legacy_out = legacy_regrid(db_bin, dates, frame_cut)
+    grid, out, matched = regrid_12d(db_bin, dates, frame_cut)
+    assert np.array_equal(legacy_grid.values, grid)
+    assert np.array_equal(legacy_out, out, equal_nan=True)
+    assert np.array_equal(matched, ~np.isnan(out).all(axis=0))
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("freq_days, frame_cut", [(12, 0), (6, 0), (6, 10), (1, 0), (5, 3)])
+def test_random_records(freq_days, frame_cut, seed):
+    db_bin, dates = synthetic_record(freq_days, seed=seed, n_bins=20)
+    assert_same_as_legacy(db_bin, dates, frame_cut)
+
+
+def test_single_date():
+    dates = np.array(["2018-06-01"], dtype="datetime64[ns]")
+    assert_same_as_legacy(np.array([[-10.0], [-12.0]]), dates)
+
+
+def test_gaps_longer_than_12_days():
+    dates = pd.to_datetime(["2018-01-01", "2018-01-13", "2018-03-14", "2018-07-12", "2018-07-24"]).values
+    db_bin = np.random.default_rng(0).normal(-12, 4, (3, len(dates)))
+    assert_same_as_legacy(db_bin, dates)
+    _, out, matched = regrid_12d(db_bin, dates)
+    assert matched.sum() == len(dates) and np.isnan(out[:, ~matched]).all()
+
+
+def test_repeated_date_uses_first_column():
+    dates = pd.to_datetime(["2018-01-01", "2018-01-13", "2018-01-13", "2018-01-25"]).values
+    db_bin = np.arange(8, dtype=float).reshape(2, 4)
+    assert_same_as_legacy(db_bin, dates)
+    _, out, _ = regrid_12d(db_bin, dates)
+    assert np.array_equal(out[:, 1], db_bin[:, 1])
+
+
+def test_empty_dates_raise_index_error():
+    # callers (plot_db_heatmap, heatmap_payload) skip a pathrow on IndexError
+    with pytest.raises(IndexError):
+        regrid_12d(np.empty((3, 0)), np.empty(0, dtype="datetime64[ns]"))
+
+
+def test_frame_cut_outside_dates_raises_index_error():
+    db_bin, dates = synthetic_record(12, n_bins=2)
+    with pytest.raises(IndexError):
+        regrid_12d(db_bin, dates, frame_cut=len(dates))